@@ -0,0 +1,95 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+from ..models import (
+    ArchivedSubtask, ArchivedTask, ArchivedTaskUserDetails, Subtask, Task, TaskUserDetails, Tombstone
+)
+from .board import bump_board_version, delete_rows, record_tombstones
+from .events import publish_event
+
+ARCHIVED_STATUS = 'done'
+TASK_COLUMNS = (
+    'cardId', 'title', 'description', 'date', 'priority', 'category', 'status', 'created_by_id', 'updated_at', 'version'
+)
+SUBTASK_COLUMNS = ('id', 'subtasktext', 'checked', 'task_id', 'updated_at')
+USER_DETAILS_COLUMNS = ('user_id', 'task_id', 'checked')
+
+
+def get_archivable_tasks(days=None):
+    """
+    Returns the tasks with the status 'done' that were last changed more than the
+    given number of days ago, by default ``TASK_ARCHIVE_AFTER_DAYS``.
+
+    :rtype: django.db.models.QuerySet
+    """
+    if days is None:
+        days = settings.TASK_ARCHIVE_AFTER_DAYS
+    threshold = now() - timedelta(days=days)
+    return Task.objects.filter(status=ARCHIVED_STATUS, updated_at__lt=threshold)
+
+
+def archive_done_tasks(days=None, batch_size=None):
+    """
+    Moves completed tasks older than ``days`` into the archive tables, together
+    with their subtasks and user assignments.
+
+    Tasks are archived in batches of ``batch_size`` (by default
+    ``TASK_ARCHIVE_BATCH_SIZE``), one transaction per batch, so the hot tables
+    are never locked for long.
+
+    :return: The number of archived tasks
+    :rtype: int
+    """
+    batch_size = batch_size or settings.TASK_ARCHIVE_BATCH_SIZE
+    archived = 0
+    while True:
+        with transaction.atomic():
+            task_ids = list(
+                get_archivable_tasks(days).select_for_update().order_by('cardId')
+                .values_list('cardId', flat=True)[:batch_size]
+            )
+            if not task_ids:
+                return archived
+            archive_tasks(task_ids)
+        archived += len(task_ids)
+
+
+def archive_tasks(task_ids):
+    """
+    Copies the tasks with the given ids, their subtasks and their user assignments
+    into the archive tables and deletes them from the board.
+
+    The rows are copied with one bulk insert per table and deleted with one DELETE
+    per table. Every owner gets tombstones for the archived tasks, a new board
+    version and a task event, so clients drop the tasks from their board.
+
+    Must be called inside a transaction.
+    """
+    tasks = Task.objects.filter(cardId__in=task_ids)
+    subtasks = Subtask.objects.filter(task__in=task_ids)
+    user_details = TaskUserDetails.objects.filter(task__in=task_ids)
+
+    owners = {}
+    archived_tasks = []
+    for row in tasks.values_list(*TASK_COLUMNS):
+        task = ArchivedTask(**dict(zip(TASK_COLUMNS, row)))
+        owners.setdefault(task.created_by_id, []).append(task.cardId)
+        archived_tasks.append(task)
+
+    ArchivedTask.objects.bulk_create(archived_tasks)
+    ArchivedSubtask.objects.bulk_create([
+        ArchivedSubtask(**dict(zip(SUBTASK_COLUMNS, row))) for row in subtasks.values_list(*SUBTASK_COLUMNS)
+    ])
+    ArchivedTaskUserDetails.objects.bulk_create([
+        ArchivedTaskUserDetails(**dict(zip(USER_DETAILS_COLUMNS, row)))
+        for row in user_details.values_list(*USER_DETAILS_COLUMNS)
+    ])
+
+    for queryset in (subtasks, user_details, tasks):
+        delete_rows(queryset)
+
+    for owner_id, card_ids in owners.items():
+        record_tombstones(owner_id, Tombstone.TASK, card_ids)
+        bump_board_version(owner_id)
+        publish_event(owner_id, 'task', 'deleted', card_ids)
@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from user_auth_app.api.async_views import AsyncAPIView
+from .board import aget_board_version, get_board_etag
+from .fast_serializers import compact_task_serializer, contact_serializer, task_serializer
+from .serializers import ContactSerializer, TaskSerializer
+from .views import ContactDetail, ContactList, TaskDetail, TaskList, get_board_queryset, is_compact
+from ..models import Contact, Task
+
+
+class AsyncBoardView(AsyncAPIView):
+    """
+    Async variant of a board view with the conditional GET support of
+    ``BoardVersionMixin``.
+
+    Subclasses implement the async ``get_data()``, which returns the serialized
+    data of the response or None if the object does not exist. Paginated
+    requests are served by the sync view.
+    """
+    pagination_params = ('page_size', 'cursor')
+
+    def use_sync_view(self, request):
+        """
+        Returns True for paginated requests.
+        """
+        return any(param in request.GET for param in self.pagination_params)
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Returns 304 Not Modified if the client's copy is still current, otherwise
+        the data from ``get_data()`` with an ``ETag`` header.
+        """
+        etag = get_board_etag(await aget_board_version(request.user.pk), request)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = await self.get_data(request, *args, **kwargs)
+            if data is None:
+                return self.render({'detail': f"No {self.model._meta.object_name} matches the given query."},
+                                   status.HTTP_404_NOT_FOUND)
+            response = self.render(data)
+
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+
+class AsyncTaskList(AsyncBoardView):
+    sync_view = TaskList
+
+    async def get_data(self, request):
+        """
+        Returns the tasks of the current user with their assigned users and
+        subtasks, or only the subtask counters for ``?compact=1``.
+        """
+        serializer = compact_task_serializer if is_compact(request) else task_serializer
+        return await sync_to_async(serializer.serialize)(get_board_queryset(request.user))
+
+
+class AsyncTaskDetail(AsyncBoardView):
+    sync_view = TaskDetail
+    model = Task
+
+    async def get_data(self, request, cardId):
+        """
+        Returns the task with the given id if it belongs to the current user.
+        """
+        task = await get_board_queryset(request.user).filter(cardId=cardId).afirst()
+        return TaskSerializer(task).data if task else None
+
+
+class AsyncContactList(AsyncBoardView):
+    sync_view = ContactList
+
+    async def get_data(self, request):
+        """
+        Returns the contacts of the current user.
+        """
+        return await sync_to_async(contact_serializer.serialize)(Contact.objects.filter(user=request.user))
+
+
+class AsyncContactDetail(AsyncBoardView):
+    sync_view = ContactDetail
+    model = Contact
+
+    async def get_data(self, request, id):
+        """
+        Returns the contact with the given id if it belongs to the current user.
+        """
+        contact = await Contact.objects.filter(user=request.user, id=id).afirst()
+        return ContactSerializer(contact).data if contact else None
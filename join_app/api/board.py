@@ -0,0 +1,173 @@
+import hashlib
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.timezone import now
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from user_auth_app.models import CustomUser
+from ..models import TaskUserDetails, Tombstone
+
+
+def get_board_version(user_id):
+    """
+    Returns the current board version of the user with the given id.
+
+    :rtype: int
+    """
+    return CustomUser.objects.filter(pk=user_id).values_list('board_version', flat=True).first() or 0
+
+
+async def aget_board_version(user_id):
+    """
+    Async version of ``get_board_version()``.
+
+    :rtype: int
+    """
+    return await CustomUser.objects.filter(pk=user_id).values_list('board_version', flat=True).afirst() or 0
+
+
+def get_board_etag(version, request):
+    """
+    Returns the ETag of the requested resource for the given board version.
+
+    :rtype: str
+    """
+    url_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()[:12]
+    return f'W/"{version}-{url_hash}"'
+
+
+def bump_board_version(user_id):
+    """
+    Increments the board version of the user with the given id.
+
+    Must be called after every write to the user's tasks, subtasks or contacts,
+    so that cached copies of the board become invalid.
+
+    :return: The new board version
+    :rtype: int
+    """
+    with transaction.atomic():
+        CustomUser.objects.filter(pk=user_id).update(board_version=F('board_version') + 1)
+        return get_board_version(user_id)
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_assignee_boards(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Increments the board versions of all boards with tasks assigned to a changed
+    user, since the task payload contains the profile of every assignee.
+
+    Saves that only touch fields outside the serialized profile, e.g. the last
+    login, leave the boards alone.
+    """
+    from user_auth_app.api.serializers import CustomUserSerializer
+
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & set(CustomUserSerializer.Meta.fields):
+        return
+    owner_ids = TaskUserDetails.objects.filter(user=instance).values('task__created_by')
+    CustomUser.objects.filter(pk__in=owner_ids).update(board_version=F('board_version') + 1)
+
+
+def record_tombstones(user_id, model, object_ids):
+    """
+    Records the deletion of the given objects from the board of the user, so that
+    the delta sync can report them to clients.
+
+    :param model: One of ``Tombstone.TASK``, ``Tombstone.SUBTASK`` or ``Tombstone.CONTACT``
+    :type model: str
+    """
+    Tombstone.objects.bulk_create([
+        Tombstone(user_id=user_id, model=model, object_id=object_id) for object_id in object_ids
+    ])
+
+
+def prune_tombstones():
+    """
+    Deletes tombstones older than ``SYNC_TOMBSTONE_RETENTION_DAYS``.
+
+    :return: The number of deleted tombstones
+    :rtype: int
+    """
+    threshold = now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=threshold).delete()
+    return deleted
+
+
+def delete_rows(queryset):
+    """
+    Deletes the rows matched by the queryset with one plain DELETE statement.
+
+    Unlike ``QuerySet.delete()``, no rows are loaded into memory, no delete
+    signals are sent and nothing is cascaded, so rows that reference the deleted
+    ones must be deleted first.
+
+    :return: The number of deleted rows
+    :rtype: int
+    """
+    db = connections[queryset.db]
+    opts = queryset.model._meta
+    subquery, params = queryset.values('pk').query.sql_with_params()
+    with db.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {db.ops.quote_name(opts.db_table)} WHERE {db.ops.quote_name(opts.pk.column)} IN ({subquery})",
+            params
+        )
+        return cursor.rowcount
+
+
+class BoardVersionMixin:
+    """
+    Adds conditional GET support based on the board version of the user and
+    increments the board version after every update and delete. List views save
+    new objects with their owner and increment the board version in their own
+    ``perform_create()``.
+
+    GET responses carry an ``ETag`` that combines the board version with the
+    requested URL. A request with a matching ``If-None-Match`` header is answered
+    with 304 Not Modified without loading or serializing the board.
+    """
+
+    def get_board_etag(self, request):
+        """
+        Returns the ETag of the requested resource for the current board version.
+        """
+        return get_board_etag(get_board_version(request.user.pk), request)
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns 304 Not Modified if the client's copy is still current, otherwise
+        the regular response with an ``ETag`` header.
+        """
+        etag = self.get_board_etag(request)
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def perform_update(self, serializer):
+        """
+        Updates the object and increments the board version.
+        """
+        super().perform_update(serializer)
+        bump_board_version(self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the object, records its tombstone and increments the board version.
+        """
+        record_tombstones(self.request.user.pk, instance._meta.model_name, [instance.pk])
+        super().perform_destroy(instance)
+        bump_board_version(self.request.user.pk)
@@ -0,0 +1,69 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+from ..models import Subtask, Task
+
+SUBTASK_COUNTER_FIELDS = ('subtasks_total', 'subtasks_done')
+
+
+def adjust_subtask_counters(task, total=0, done=0):
+    """
+    Adds the given differences to the subtask counters of the task.
+
+    The counters are changed with one UPDATE using F-expressions, so concurrent
+    changes to other subtasks of the task are not lost. ``updated_at`` is set as
+    well, so the delta sync reports the new counters. The counters of the task
+    instance are adjusted too, so it can be serialized without reloading.
+
+    :param total: The change of the number of subtasks
+    :type total: int
+    :param done: The change of the number of checked subtasks
+    :type done: int
+    """
+    if not total and not done:
+        return
+    Task.objects.filter(pk=task.pk).update(
+        subtasks_total=F('subtasks_total') + total,
+        subtasks_done=F('subtasks_done') + done,
+        updated_at=now()
+    )
+    task.subtasks_total += total
+    task.subtasks_done += done
+
+
+def count_subtasks(**filters):
+    """
+    Returns a subquery that counts the subtasks of the outer task that match the
+    given filters.
+
+    :rtype: django.db.models.expressions.Expression
+    """
+    subtasks = Subtask.objects.filter(task=OuterRef('pk'), **filters).order_by().values('task')
+    return Coalesce(Subquery(subtasks.annotate(count=Count('pk')).values('count')), 0, output_field=IntegerField())
+
+
+def repair_subtask_counters(batch_size=500):
+    """
+    Recomputes the subtask counters of all tasks whose counters differ from the
+    actual number of subtasks.
+
+    The drifted tasks are found with one query. Their counters are recomputed in
+    the database with one UPDATE per ``batch_size`` tasks, so subtasks changed in
+    the meantime are counted correctly.
+
+    :return: The number of repaired tasks
+    :rtype: int
+    """
+    drifted_ids = list(Task.objects.annotate(
+        actual_total=count_subtasks(),
+        actual_done=count_subtasks(checked=True)
+    ).filter(
+        ~Q(subtasks_total=F('actual_total')) | ~Q(subtasks_done=F('actual_done'))
+    ).values_list('pk', flat=True))
+
+    for start in range(0, len(drifted_ids), batch_size):
+        Task.objects.filter(pk__in=drifted_ids[start:start + batch_size]).update(
+            subtasks_total=count_subtasks(),
+            subtasks_done=count_subtasks(checked=True)
+        )
+    return len(drifted_ids)
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from ..models import Contact, Task, Subtask
+
+
+class InProcessBroker:
+    """
+    Delivers board events to the event streams of the current process.
+
+    Every stream subscribes with the id of its user and gets an asyncio queue.
+    Events can be published from any thread, they are handed over to the event
+    loop of each subscriber.
+    """
+
+    def __init__(self):
+        """
+        Initialize the broker without subscribers.
+        """
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """
+        Registers a new event stream of the given user.
+
+        Must be called from the event loop that reads the queue.
+
+        :return: The queue that receives the events of the user
+        :rtype: asyncio.Queue
+        """
+        queue = asyncio.Queue(maxsize=settings.BOARD_EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(user_id, {})[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        """
+        Removes the event stream that reads the given queue.
+        """
+        with self._lock:
+            queues = self._subscribers.get(user_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id, event):
+        """
+        Publishes an event to all streams of the given user.
+        """
+        self.dispatch(user_id, event)
+
+    def dispatch(self, user_id, event):
+        """
+        Puts the event into the queues of all local streams of the given user.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, {}).items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put_event, queue, event)
+            except RuntimeError:
+                self.unsubscribe(user_id, queue)
+
+
+def _put_event(queue, event):
+    """
+    Puts the event into the queue. If a slow client let the queue run full, the
+    pending events are replaced by a single resync event, after which the client
+    loads the changes with the sync endpoint.
+    """
+    if queue.full():
+        while not queue.empty():
+            queue.get_nowait()
+        event = {'type': 'resync'}
+    queue.put_nowait(event)
+
+
+class SpoolBroker(InProcessBroker):
+    """
+    Shares board events between the worker processes of one host through an
+    append-only spool file.
+
+    Published events are appended to ``BOARD_EVENTS_SPOOL``. Every process follows
+    the file in a background thread and dispatches new events to its local
+    streams, including the events it published itself. Once the file exceeds
+    ``BOARD_EVENTS_SPOOL_MAX_SIZE`` bytes it is renamed to ``BOARD_EVENTS_SPOOL``
+    + '.1', replacing the previous rotated file, and a new file is started.
+    Followers read the rest of the renamed file before they switch over.
+
+    This is a local stand-in for a real message broker: any class with
+    ``subscribe``, ``unsubscribe`` and ``publish`` can be configured in
+    ``BOARD_EVENTS_BROKER``.
+    """
+
+    def __init__(self):
+        """
+        Initialize the broker. The spool file is followed once the first stream
+        subscribes.
+        """
+        super().__init__()
+        self.path = settings.BOARD_EVENTS_SPOOL
+        self._follower = None
+
+    def subscribe(self, user_id):
+        """
+        Registers a new event stream and starts following the spool file.
+
+        :rtype: asyncio.Queue
+        """
+        with self._lock:
+            if self._follower is None:
+                self._follower = threading.Thread(target=self._follow, name='board-events-spool', daemon=True)
+                self._follower.start()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id, event):
+        """
+        Appends the event to the spool file as one JSON line, after rotating the
+        file if it has grown too large.
+        """
+        self.rotate()
+        line = json.dumps({'user': user_id, 'event': event}) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as spool:
+            spool.write(line)
+
+    def rotate(self):
+        """
+        Renames the spool file to ``<path>.1`` if it is larger than
+        ``BOARD_EVENTS_SPOOL_MAX_SIZE`` bytes.
+
+        :return: True if the file was rotated
+        :rtype: bool
+        """
+        try:
+            if os.path.getsize(self.path) <= settings.BOARD_EVENTS_SPOOL_MAX_SIZE:
+                return False
+            os.replace(self.path, self.path + '.1')
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _follow(self):
+        """
+        Reads events appended to the spool file and dispatches them. Starts at the
+        current end of the file and continues with the new file after a rotation.
+        """
+        spool = open(self.path, 'a+', encoding='utf-8')
+        spool.seek(0, os.SEEK_END)
+        pending = ''
+        while True:
+            line = spool.readline()
+            if not line:
+                if self._is_rotated(spool):
+                    spool.close()
+                    spool = open(self.path, 'a+', encoding='utf-8')
+                    spool.seek(0)
+                    pending = ''
+                else:
+                    time.sleep(settings.BOARD_EVENTS_SPOOL_POLL_INTERVAL)
+                continue
+
+            pending += line
+            if not pending.endswith('\n'):
+                continue
+            try:
+                message = json.loads(pending)
+                self.dispatch(message['user'], message['event'])
+            except (ValueError, KeyError) as e:
+                print(f"[Events] Skipping invalid spool entry: {e}")
+            pending = ''
+
+    def _is_rotated(self, spool):
+        """
+        Returns True if the open spool file is no longer the file at the spool path.
+        """
+        try:
+            return os.stat(self.path).st_ino != os.fstat(spool.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Returns the broker configured in ``BOARD_EVENTS_BROKER``, created once per
+    process.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.BOARD_EVENTS_BROKER)()
+    return _broker
+
+
+def publish_event(user_id, model, action, object_ids):
+    """
+    Publishes a change of board objects of the given user once the current
+    transaction is committed.
+
+    :param model: The type of the objects, 'task', 'subtask' or 'contact'
+    :param action: 'saved' or 'deleted'
+    :param object_ids: The ids of the changed objects
+    """
+    event = {'type': model, 'action': action, 'ids': list(object_ids)}
+    if event['ids']:
+        transaction.on_commit(lambda: get_broker().publish(user_id, event))
+
+
+def get_subtask_owner_id(subtask):
+    """
+    Returns the id of the user that owns the task of the subtask.
+    """
+    if Subtask.task.is_cached(subtask):
+        return subtask.task.created_by_id
+    return Task.objects.filter(pk=subtask.task_id).values_list('created_by_id', flat=True).first()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def publish_task_event(sender, instance, **kwargs):
+    """
+    Publishes an event for a saved or deleted task.
+    """
+    action = 'saved' if kwargs['signal'] is post_save else 'deleted'
+    publish_event(instance.created_by_id, 'task', action, [instance.pk])
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def publish_subtask_event(sender, instance, **kwargs):
+    """
+    Publishes an event for a saved or deleted subtask.
+    """
+    owner_id = get_subtask_owner_id(instance)
+    if owner_id is not None:
+        action = 'saved' if kwargs['signal'] is post_save else 'deleted'
+        publish_event(owner_id, 'subtask', action, [instance.pk])
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+def publish_contact_event(sender, instance, **kwargs):
+    """
+    Publishes an event for a saved or deleted contact.
+    """
+    action = 'saved' if kwargs['signal'] is post_save else 'deleted'
+    publish_event(instance.user_id, 'contact', action, [instance.pk])
+
+
+def format_event(event):
+    """
+    Formats an event as a Server-Sent Events message.
+
+    :rtype: str
+    """
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,209 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+from user_auth_app.api.serializers import CustomUserSerializer
+from ..models import Subtask, TaskUserDetails
+from .serializers import (
+    CompactTaskSerializer, ContactSerializer, SubtaskSerializer, TaskSerializer, TaskSubtaskSerializer
+)
+
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+
+def get_converter(field):
+    """
+    Returns the function that turns a database value into the output of the given
+    serializer field, or None if the value can be used as it is.
+
+    Fields without a known shortcut use their own ``to_representation()``.
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, IDENTITY_FIELDS):
+        return None
+    if isinstance(field, serializers.BooleanField):
+        return field.to_representation
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if isinstance(output_format, str) and output_format.lower() == ISO_8601:
+            return date_to_iso
+    return field.to_representation
+
+
+def date_to_iso(value):
+    """
+    Returns the ISO 8601 representation of a date, like DRF's ``DateField``.
+    """
+    return value.isoformat()
+
+
+class CompiledSerializer:
+    """
+    Read-only serializer that builds the output of a flat ``ModelSerializer``
+    directly from ``values_list()`` rows.
+
+    The field plan (output names, database columns and value converters) is
+    compiled once from the serializer fields, so a row costs one ``dict`` instead
+    of a pass through the per-field machinery of DRF. The output is the same as
+    the one of the DRF serializer. Nested serializer fields are left out and can
+    be added by subclasses.
+    """
+
+    def __init__(self, serializer_class, prefix=''):
+        """
+        Initialize the serializer for the given ``ModelSerializer`` class. With a
+        prefix like ``'user__'`` the columns are read through a relation.
+        """
+        self.serializer_class = serializer_class
+        self.prefix = prefix
+        self._plan = None
+
+    @property
+    def plan(self):
+        """
+        Returns the compiled field plan: the output names, the columns and the
+        converters as ``(index, converter)`` pairs.
+        """
+        if self._plan is None:
+            names, columns, converters = [], [], []
+            for name, field in self.serializer_class().fields.items():
+                if field.write_only or isinstance(field, serializers.BaseSerializer):
+                    continue
+                converter = get_converter(field)
+                if converter is not None:
+                    converters.append((len(names), converter))
+                names.append(name)
+                columns.append(self.prefix + field.source)
+            self._plan = (tuple(names), tuple(columns), tuple(converters))
+        return self._plan
+
+    @property
+    def columns(self):
+        """
+        Returns the columns to read with ``values_list()``.
+        """
+        return self.plan[1]
+
+    def to_representation(self, row):
+        """
+        Returns the output of one ``values_list()`` row.
+
+        :rtype: dict
+        """
+        names, _, converters = self.plan
+        if converters:
+            row = list(row)
+            for index, converter in converters:
+                if row[index] is not None:
+                    row[index] = converter(row[index])
+        return dict(zip(names, row))
+
+    def serialize(self, queryset):
+        """
+        Returns the output of all objects in the queryset.
+
+        :rtype: list
+        """
+        to_representation = self.to_representation
+        return [to_representation(row) for row in queryset.prefetch_related(None).values_list(*self.columns)]
+
+
+class CompiledTaskSerializer(CompiledSerializer):
+    """
+    Read-only version of ``TaskSerializer`` including the assigned users and the
+    subtasks of each task, loaded with one query each. Subtasks are left out if
+    the serializer class has no ``subtasks`` field.
+    """
+
+    def __init__(self, serializer_class=TaskSerializer):
+        """
+        Initialize the serializer together with the compiled serializers of the
+        assigned users and the subtasks.
+        """
+        super().__init__(serializer_class)
+        self.with_subtasks = 'subtasks' in serializer_class.Meta.fields
+        self.user_serializer = CompiledSerializer(CustomUserSerializer, prefix='user__')
+        self.subtask_serializer = CompiledSerializer(TaskSubtaskSerializer)
+
+    def serialize(self, queryset):
+        """
+        Returns the output of all tasks in the queryset.
+
+        :rtype: list
+        """
+        tasks = super().serialize(queryset)
+        if not tasks:
+            return tasks
+        task_ids = [task['cardId'] for task in tasks]
+
+        users, subtasks = {}, {}
+        user_rows = TaskUserDetails.objects.filter(task__in=task_ids).values_list(
+            'task_id', 'checked', *self.user_serializer.columns
+        )
+        for task_id, checked, *user in user_rows:
+            users.setdefault(task_id, []).append({
+                'user': self.user_serializer.to_representation(user),
+                'checked': checked,
+            })
+
+        for task in tasks:
+            task['user'] = users.get(task['cardId'], [])
+        if not self.with_subtasks:
+            return tasks
+
+        subtask_rows = Subtask.objects.filter(task__in=task_ids).values_list(
+            'task_id', *self.subtask_serializer.columns
+        )
+        for task_id, *subtask in subtask_rows:
+            subtasks.setdefault(task_id, []).append(self.subtask_serializer.to_representation(subtask))
+
+        for task in tasks:
+            task['subtasks'] = subtasks.get(task['cardId'], [])
+        return tasks
+
+
+contact_serializer = CompiledSerializer(ContactSerializer)
+user_serializer = CompiledSerializer(CustomUserSerializer)
+subtask_serializer = CompiledSerializer(SubtaskSerializer)
+task_serializer = CompiledTaskSerializer()
+compact_task_serializer = CompiledTaskSerializer(CompactTaskSerializer)
+
+
+class CompiledListMixin:
+    """
+    Serves unpaginated lists of a generic list view with the compiled serializer
+    in ``compiled_serializer``. Paginated lists and all other requests use the
+    regular serializer of the view.
+
+    Lists with at least ``JSON_STREAMING_THRESHOLD`` items are streamed in chunks
+    if the negotiated renderer supports it.
+    """
+    compiled_serializer = None
+
+    def get_compiled_serializer(self):
+        """
+        Returns the compiled serializer of unpaginated lists.
+        """
+        return self.compiled_serializer
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the list of objects, serialized from ``values_list()`` rows if the
+        list is not paginated.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        data = self.get_compiled_serializer().serialize(queryset)
+        renderer = getattr(request, 'accepted_renderer', None)
+        if len(data) >= settings.JSON_STREAMING_THRESHOLD and hasattr(renderer, 'iter_render'):
+            return StreamingHttpResponse(
+                renderer.iter_render(data, request.accepted_media_type, self.get_renderer_context()),
+                content_type=renderer.media_type
+            )
+        return Response(data)
@@ -0,0 +1,236 @@
+import time
+import zlib
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+
+class BrotliCompressor:
+    """
+    Wraps ``brotli.Compressor`` in the ``compress()``/``flush()`` interface of
+    zlib compression objects.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new brotli stream.
+        """
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        """
+        Returns the compressed output for the data that is ready.
+        """
+        return self._compressor.process(data)
+
+    def flush(self):
+        """
+        Returns the rest of the compressed output and ends the stream.
+        """
+        return self._compressor.finish()
+
+
+def get_compressors():
+    """
+    Returns the factories of incremental compressors by content coding, for all
+    codings whose library is installed. gzip is always available, brotli and zstd
+    need the optional ``brotli`` and ``zstandard`` packages.
+
+    :rtype: dict
+    """
+    compressors = {'gzip': lambda: zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)}
+    if brotli is not None:
+        compressors['br'] = BrotliCompressor
+    if zstandard is not None:
+        compressors['zstd'] = lambda: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return compressors
+
+
+COMPRESSORS = get_compressors()
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Returns the content coding to use for the given ``Accept-Encoding`` header or
+    None if the client accepts none of the available codings.
+
+    The coding with the highest quality value wins, ties are decided by the order
+    of ``COMPRESSION_ENCODINGS``.
+
+    :rtype: str
+    """
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+
+    candidates = [
+        (accepted.get(coding, accepted.get('*', 0.0)), -index, coding)
+        for index, coding in enumerate(settings.COMPRESSION_ENCODINGS)
+        if coding in COMPRESSORS
+    ]
+    quality, _, coding = max(candidates, default=(0.0, 0, None))
+    return coding if quality > 0 else None
+
+
+class CompressionStats:
+    """
+    Counts the bytes and the CPU time of compressing one response.
+    """
+
+    def __init__(self, coding):
+        """
+        Initialize the counters for a response compressed with the given coding.
+        """
+        self.coding = coding
+        self.original = 0
+        self.compressed = 0
+        self.cpu_time = 0.0
+
+    def compress(self, compressor, data, finish=False):
+        """
+        Feeds data into the compressor and returns the compressed output that is
+        ready, including the end of the stream if ``finish`` is True.
+
+        :rtype: bytes
+        """
+        start = time.process_time()
+        output = compressor.compress(data)
+        if finish:
+            output += compressor.flush()
+        self.cpu_time += time.process_time() - start
+        self.original += len(data)
+        self.compressed += len(output)
+        return output
+
+    def __str__(self):
+        """
+        Returns the statistics in the format of the ``X-Compression`` header.
+        """
+        return (f"{self.coding}; {self.original} -> {self.compressed} bytes; "
+                f"saved {self.original - self.compressed}; cpu {self.cpu_time * 1000:.2f} ms")
+
+
+class CompressionMiddleware:
+    """
+    Compresses large responses of the endpoints in ``COMPRESSION_URL_NAMES`` with
+    the best content coding the client accepts (zstd, brotli or gzip).
+
+    Responses smaller than ``COMPRESSION_MIN_SIZE`` bytes are sent as they are.
+    Streaming responses are compressed chunk by chunk while they are sent. In
+    debug mode the coding, the bytes saved and the CPU time are reported in the
+    ``X-Compression`` header, or printed once a streaming response is finished.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware with a callable ``get_response`` which is used to
+        get the response for the current request. The middleware runs sync or
+        async, depending on ``get_response``.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Returns the response, compressed if possible.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        """
+        Async version of ``__call__()``.
+        """
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        """
+        Compresses the response body if the endpoint, the response and the
+        client allow it.
+        """
+        match = request.resolver_match
+        if match is None or match.url_name not in settings.COMPRESSION_URL_NAMES:
+            return response
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+        if coding is None:
+            return response
+
+        compressor = COMPRESSORS[coding]()
+        stats = CompressionStats(coding)
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.acompress_stream(response.streaming_content, compressor, stats)
+            else:
+                response.streaming_content = self.compress_stream(response.streaming_content, compressor, stats)
+            response.headers.pop('Content-Length', None)
+            if settings.DEBUG:
+                response['X-Compression'] = f"{coding}; streaming"
+        else:
+            response.content = stats.compress(compressor, response.content, finish=True)
+            response['Content-Length'] = str(len(response.content))
+            if settings.DEBUG:
+                response['X-Compression'] = str(stats)
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = coding
+        return response
+
+    def compress_stream(self, chunks, compressor, stats):
+        """
+        Compresses the chunks of a streaming response as they are produced.
+        """
+        for chunk in chunks:
+            output = stats.compress(compressor, chunk)
+            if output:
+                yield output
+        yield stats.compress(compressor, b'', finish=True)
+        if settings.DEBUG:
+            print(f"[Compression] {stats}")
+
+    async def acompress_stream(self, chunks, compressor, stats):
+        """
+        Async version of ``compress_stream()``.
+        """
+        async for chunk in chunks:
+            output = stats.compress(compressor, chunk)
+            if output:
+                yield output
+        yield stats.compress(compressor, b'', finish=True)
+        if settings.DEBUG:
+            print(f"[Compression] {stats}")
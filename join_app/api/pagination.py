@@ -0,0 +1,161 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination.
+
+    Lists stay unpaginated unless the request contains a ``page_size`` or a
+    ``cursor`` query parameter, or ``optional`` is set to False. Pages are selected with a WHERE condition on the
+    last row of the previous page instead of an OFFSET, so every page costs the
+    same no matter how far the client has scrolled.
+
+    Views define their stable orderings in ``keyset_orderings``, a dict that maps
+    the value of the ``ordering`` query parameter to a tuple of unique field
+    names. The first entry is the default ordering.
+    """
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    default_page_size = 50
+    max_page_size = 200
+    optional = True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns the requested page as a list or None if pagination was not requested.
+
+        :raises: NotFound if the cursor or the ordering is invalid
+        """
+        params = request.query_params
+        requested = self.page_size_query_param in params or self.cursor_query_param in params
+        if self.optional and not requested:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering_name, self.ordering = self.get_ordering(request, view)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.get_position_filter(position))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound('Invalid cursor.')
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = [getattr(rows[-1], field) for field in self.ordering] if self.has_next else None
+        return rows
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, capped at ``max_page_size``.
+        """
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.default_page_size))
+        except ValueError:
+            page_size = self.default_page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, request, view):
+        """
+        Returns the name and the fields of the requested ordering.
+
+        :raises: NotFound if the view does not support the requested ordering
+        """
+        orderings = view.keyset_orderings
+        name = request.query_params.get(self.ordering_query_param, next(iter(orderings)))
+        if name not in orderings:
+            raise NotFound('Invalid ordering.')
+        return name, orderings[name]
+
+    def get_position_filter(self, position):
+        """
+        Returns a Q object that selects all rows after the given position.
+
+        For the ordering ``(date, cardId)`` this is
+        ``date > d OR (date = d AND cardId > c)``.
+        """
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            equal = {previous: position[i] for i, previous in enumerate(self.ordering[:index])}
+            condition |= Q(**equal, **{f'{field}__gt': position[index]})
+        return condition
+
+    def encode_cursor(self, position):
+        """
+        Encodes the ordering and the position of the last row as an opaque cursor.
+        """
+        data = json.dumps([self.ordering_name, position], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        Returns the position stored in the cursor of the request or None.
+
+        :raises: NotFound if the cursor is invalid
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            ordering_name, position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound('Invalid cursor.')
+
+        if not isinstance(position, list) or ordering_name != self.ordering_name:
+            raise NotFound('Invalid cursor.')
+        if len(position) != len(self.ordering):
+            raise NotFound('Invalid cursor.')
+        return position
+
+    def get_next_link(self):
+        """
+        Returns the URL of the next page or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        """
+        Returns the page together with the link to the next page.
+        """
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Returns the OpenAPI schema of a paginated response.
+        """
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class RequiredKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination that always returns pages, for lists that can grow without
+    bound.
+    """
+    optional = False
@@ -0,0 +1,31 @@
+import io
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser that decodes UTF-8 request bodies with orjson if it is installed.
+
+    Other encodings and bodies orjson rejects are parsed by DRF's ``JSONParser``,
+    so invalid JSON is reported with the same error as before. Unlike the
+    standard library, orjson reads integers beyond 64 bit as floats, which the
+    integer fields of the API reject instead of failing in the database.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parses the incoming bytestream as JSON and returns the resulting data.
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
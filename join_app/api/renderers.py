@@ -0,0 +1,89 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# UTF-8 encoded U+2028 and U+2029, which JSONRenderer escapes
+LINE_SEPARATOR_PREFIX = b'\xe2\x80'
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes with orjson if it is installed.
+
+    The output is the same as the one of DRF's ``JSONRenderer`` with the default
+    settings: compact, not ASCII-escaped, with dates, times, Decimals and lazy
+    strings encoded by DRF's ``JSONEncoder``. Without orjson, with indentation
+    or with non-default JSON settings, and for data orjson cannot encode (e.g.
+    integers beyond 64 bit or non-string keys) the renderer falls back to
+    ``JSONRenderer``.
+
+    ``iter_render()`` encodes large lists in chunks for streaming responses.
+    """
+    chunk_size = 100
+
+    def __init__(self):
+        """
+        Initialize the renderer with DRF's encoder for the types orjson passes on.
+        """
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+        if not self.can_encode(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return self.encode(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+    def iter_render(self, items, accepted_media_type=None, renderer_context=None):
+        """
+        Renders a list into JSON in chunks of ``chunk_size`` items, so that a large
+        response does not have to be built as one bytestring.
+
+        :return: A generator of bytestrings
+        """
+        if not self.can_encode(accepted_media_type, renderer_context):
+            yield super().render(items, accepted_media_type, renderer_context)
+            return
+
+        yield b'['
+        for start in range(0, len(items), self.chunk_size):
+            chunk = items[start:start + self.chunk_size]
+            try:
+                encoded = self.encode(chunk)
+            except orjson.JSONEncodeError:
+                encoded = super().render(chunk, accepted_media_type, renderer_context)
+            yield (b',' if start else b'') + encoded[1:-1]
+        yield b']'
+
+    def can_encode(self, accepted_media_type, renderer_context):
+        """
+        Returns True if orjson produces the same output as ``JSONRenderer``.
+        """
+        return (
+            orjson is not None
+            and self.compact and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def encode(self, data):
+        """
+        Encodes the data with orjson and escapes the line separators like
+        ``JSONRenderer``.
+
+        :raises: orjson.JSONEncodeError if orjson cannot encode the data
+        """
+        ret = orjson.dumps(data, default=self.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        if LINE_SEPARATOR_PREFIX in ret:
+            for separator, escaped in LINE_SEPARATORS:
+                ret = ret.replace(separator, escaped)
+        return ret
@@ -0,0 +1,201 @@
+import re
+from django.db import connection
+from django.db.models import Q
+from ..models import Task
+
+FTS_TABLE = 'join_app_task_fts'
+
+SUBTASK_TEXT = (
+    "(SELECT coalesce(group_concat(subtasktext, ' '), '') FROM join_app_subtask WHERE task_id = {task_id})"
+)
+
+CREATE_TABLE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, description, subtasks, created_by_id,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, title, description, subtasks, created_by_id)
+    SELECT t.cardId, t.title, t.description, {SUBTASK_TEXT.format(task_id='t.cardId')}, t.created_by_id
+    FROM join_app_task t
+    """,
+]
+
+TRIGGERS = {
+    'join_app_task_fts_insert': f"""
+    CREATE TRIGGER join_app_task_fts_insert AFTER INSERT ON join_app_task BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description, subtasks, created_by_id)
+        VALUES (new.cardId, new.title, new.description, '', new.created_by_id);
+    END
+    """,
+    'join_app_task_fts_update': f"""
+    CREATE TRIGGER join_app_task_fts_update AFTER UPDATE OF title, description, created_by_id ON join_app_task BEGIN
+        UPDATE {FTS_TABLE}
+        SET title = new.title, description = new.description, created_by_id = new.created_by_id
+        WHERE rowid = new.cardId;
+    END
+    """,
+    'join_app_task_fts_delete': f"""
+    CREATE TRIGGER join_app_task_fts_delete AFTER DELETE ON join_app_task BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.cardId;
+    END
+    """,
+    'join_app_subtask_fts_insert': f"""
+    CREATE TRIGGER join_app_subtask_fts_insert AFTER INSERT ON join_app_subtask BEGIN
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='new.task_id')}
+        WHERE rowid = new.task_id;
+    END
+    """,
+    'join_app_subtask_fts_update': f"""
+    CREATE TRIGGER join_app_subtask_fts_update AFTER UPDATE OF subtasktext, task_id ON join_app_subtask BEGIN
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='old.task_id')}
+        WHERE rowid = old.task_id;
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='new.task_id')}
+        WHERE rowid = new.task_id;
+    END
+    """,
+    'join_app_subtask_fts_delete': f"""
+    CREATE TRIGGER join_app_subtask_fts_delete AFTER DELETE ON join_app_subtask BEGIN
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='old.task_id')}
+        WHERE rowid = old.task_id;
+    END
+    """,
+}
+
+_fts_available = None
+
+
+def supports_search_index(db):
+    """
+    Returns True if the given database connection can hold the FTS5 index, which
+    needs SQLite compiled with FTS5 support.
+
+    :rtype: bool
+    """
+    if db.vendor != 'sqlite':
+        return False
+    with db.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def get_missing_index_objects(db):
+    """
+    Returns the names of the FTS5 table and triggers that are missing in the
+    given database.
+
+    :rtype: list
+    """
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+    return [name for name in [FTS_TABLE, *TRIGGERS] if name not in existing]
+
+
+def drop_search_index(db):
+    """
+    Drops the FTS5 index and its triggers.
+    """
+    with db.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def rebuild_search_index(db):
+    """
+    Creates the FTS5 index of tasks and subtasks from scratch, fills it with the
+    existing tasks and creates the triggers that keep it in sync. Does nothing
+    if the database does not support the index.
+    """
+    global _fts_available
+    if not supports_search_index(db):
+        return
+    drop_search_index(db)
+    with db.cursor() as cursor:
+        for sql in [*CREATE_TABLE_SQL, *TRIGGERS.values()]:
+            cursor.execute(sql)
+    _fts_available = None
+
+
+def ensure_search_index(db):
+    """
+    Rebuilds the FTS5 index if the table or one of its triggers is missing.
+
+    SQLite drops the triggers of a table whenever Django has to rebuild the table
+    in a migration, e.g. to add a column, so this runs after every ``migrate``.
+
+    :return: True if the index was rebuilt
+    :rtype: bool
+    """
+    if not supports_search_index(db) or Task._meta.db_table not in db.introspection.table_names():
+        return False
+    if not get_missing_index_objects(db):
+        return False
+    rebuild_search_index(db)
+    return True
+
+
+def has_search_index():
+    """
+    Returns True if the database has the FTS5 index with all of its triggers.
+    Without the triggers the index would be outdated, so the search falls back to
+    LIKE queries. The result is cached per process.
+
+    :rtype: bool
+    """
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = connection.vendor == 'sqlite' and not get_missing_index_objects(connection)
+    return _fts_available
+
+
+def get_search_terms(query):
+    """
+    Splits the search input into words. Everything except letters and digits is
+    dropped, so the input cannot inject FTS5 query syntax.
+
+    :rtype: list
+    """
+    return re.findall(r'\w+', query.lower())
+
+
+def search_task_ids(user, query, limit):
+    """
+    Returns the ids of the tasks of the given user that contain all words of the
+    query in the title, the description or a subtask, best matches first.
+
+    Every word matches as a prefix, so "rep" finds "report". With the FTS5 index
+    the tasks are ranked with bm25, where title hits weigh more than description
+    and subtask hits. Without the index, the tasks are filtered with LIKE queries
+    and ordered by their id.
+
+    :return: The ranked task ids
+    :rtype: list
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return []
+
+    if has_search_index():
+        match = f'created_by_id:"{user.pk}" AND {{title description subtasks}}: ('
+        match += ' '.join(f'"{term}"*' for term in terms) + ')'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, 10.0, 4.0, 2.0, 0.0) LIMIT %s",
+                [match, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    tasks = Task.objects.filter(created_by=user)
+    for term in terms:
+        tasks = tasks.filter(
+            Q(title__icontains=term)
+            | Q(description__icontains=term)
+            | Q(subtasks__subtasktext__icontains=term)
+        )
+    tasks = tasks.distinct().order_by('cardId')
+    return list(tasks.values_list('cardId', flat=True)[:limit])
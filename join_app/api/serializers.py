@@ -1,9 +1,19 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now
 from rest_framework import serializers
-from ..models import Contact, Task, Subtask, TaskUserDetails
+from ..models import (
+    ArchivedSubtask, ArchivedTask, ArchivedTaskUserDetails, Contact, Task, Subtask, TaskUserDetails, Tombstone
+)
+from .board import record_tombstones
+from .counters import SUBTASK_COUNTER_FIELDS, adjust_subtask_counters
+from .events import publish_event
 from user_auth_app.models import CustomUser
-from user_auth_app.api.serializers import CustomUserSerializer
+from user_auth_app.api.serializers import CustomUserSerializer, UserIdListField
 import re
 
+MAX_SUBTASKS = 5
+
 class ContactSerializer(serializers.ModelSerializer):
     class Meta:
         model = Contact
@@ -75,16 +85,20 @@ class SubtaskSerializer(serializers.ModelSerializer):
         fields = ('id', 'subtasktext', 'checked', 'task')
         read_only_fields = ('task',)
 
-    def validate_subtasks(self, value):
-        """
-        Validates a list of subtasks.
+class TaskSubtaskSerializer(SubtaskSerializer):
+    id = serializers.IntegerField(required=False)
 
-        Raises:
-            serializers.ValidationError: If the list has more than 5 elements.
-        """
-        if len(value) > 5:
-            raise serializers.ValidationError("maximum 5 subtasks.")
-        return value
+class SubtaskToggleSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    checked = serializers.BooleanField()
+
+class TaskMoveSerializer(serializers.Serializer):
+    cardId = serializers.IntegerField()
+    status = serializers.CharField(max_length=20)
+
+class TaskStatusSerializer(serializers.Serializer):
+    status = serializers.CharField(max_length=20)
+    version = serializers.IntegerField(min_value=0, required=False)
 
 class TaskUserDetailsSerializer(serializers.ModelSerializer):
     user = CustomUserSerializer()
@@ -94,30 +108,30 @@ class TaskUserDetailsSerializer(serializers.ModelSerializer):
         fields = ('user', 'checked')
 
 class TaskSerializer(serializers.ModelSerializer):
-    user_ids = serializers.ListField(
-        child=serializers.IntegerField(),
-        write_only=True,
-        required=False
-    )
+    user_ids = UserIdListField(write_only=True, required=False)
     user = TaskUserDetailsSerializer(source='user_statuses', many=True, read_only=True)
-    subtasks = SubtaskSerializer(many=True, required=False)
+    subtasks = TaskSubtaskSerializer(many=True, required=False)
 
     class Meta:
         model = Task
-        fields = ('cardId', 'title', 'description', 'date', 'priority', 'category', 'status', 'user_ids', 'user', 'subtasks')
+        fields = (
+            'cardId', 'title', 'description', 'date', 'priority', 'category', 'status', 'version', 'subtasks_total',
+            'subtasks_done', 'user_ids', 'user', 'subtasks'
+        )
+        read_only_fields = ('version', 'subtasks_total', 'subtasks_done')
 
-    def validate_user_ids(self, user_ids):
+    def validate_subtasks(self, value):
         """
-        Validates a list of user IDs.
+        Validates the nested subtasks of a task.
 
         Raises:
-            serializers.ValidationError: If any user ID does not exist.
+            serializers.ValidationError: If the list has more than MAX_SUBTASKS elements.
         """
-        for user_id in user_ids:
-            if not CustomUser.objects.filter(id=user_id).exists():
-                raise serializers.ValidationError(f"Invalid user ID: {user_id}")
-        return user_ids
+        if len(value) > MAX_SUBTASKS:
+            raise serializers.ValidationError(f"maximum {MAX_SUBTASKS} subtasks.")
+        return value
 
+    @transaction.atomic
     def create(self, validated_data):
         """
         Creates a new task.
@@ -126,7 +140,7 @@ class TaskSerializer(serializers.ModelSerializer):
 
         Assigns the task to the users with the IDs provided in the validated data.
 
-        Replaces the subtasks of the task with the subtasks provided in the validated data.
+        Creates the subtasks provided in the validated data.
 
         :return: The created task.
         """
@@ -139,27 +153,38 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return task
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """
         Updates an existing task.
 
         Updates an existing task with the validated data.
 
-        Assigns the task to the users with the IDs provided in the validated data.
-
-        Replaces the subtasks of the task with the subtasks provided in the validated data.
+        Increments the version of the task in the database and reconciles the assigned users and
+        the subtasks with the ones provided in the validated data, applying only
+        the differences. In a partial update, users
+        and subtasks are left untouched if they are not part of the request.
+        The subtask counters are not saved from the instance, they are only
+        changed with F-expressions.
 
         :return: The updated task.
         """
-        subtasks_data = validated_data.pop('subtasks', [])
-        user_ids = validated_data.pop('user_ids', [])
+        subtasks_data = validated_data.pop('subtasks', None)
+        user_ids = validated_data.pop('user_ids', None)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        instance.version = F('version') + 1
+        instance.save(update_fields=[
+            field.name for field in Task._meta.concrete_fields
+            if not field.primary_key and field.name not in SUBTASK_COUNTER_FIELDS
+        ])
+        instance.refresh_from_db(fields=['version'])
 
-        self._assign_task_users(instance, user_ids)
-        self._assign_subtasks(instance, subtasks_data)
+        if user_ids is not None or not self.partial:
+            self._assign_task_users(instance, user_ids or [])
+        if subtasks_data is not None or not self.partial:
+            self._assign_subtasks(instance, subtasks_data or [])
 
         return instance
 
@@ -167,22 +192,98 @@ class TaskSerializer(serializers.ModelSerializer):
         """
         Assigns the task to the users with the IDs provided in user_ids.
 
-        First clears any existing user assignments, then creates new TaskUserDetails
-        objects for each user ID in user_ids.
+        Only the differences to the current assignments are written: assignments of
+        users that are no longer listed are deleted, new users are added with one
+        bulk insert. Existing assignments keep their rows.
         """
-        task.user.clear()
+        assigned_ids = {details.user_id for details in task.user_statuses.all()}
+        user_ids = list(dict.fromkeys(user_ids))
+
+        removed_ids = assigned_ids.difference(user_ids)
+        if removed_ids:
+            TaskUserDetails.objects.filter(task=task, user_id__in=removed_ids).delete()
+
         TaskUserDetails.objects.bulk_create([
-            TaskUserDetails(task=task, user_id=user_id, checked=True) for user_id in user_ids
+            TaskUserDetails(task=task, user_id=user_id, checked=True)
+            for user_id in user_ids if user_id not in assigned_ids
         ])
 
     def _assign_subtasks(self, task, subtasks_data):
         """
-        Replaces the subtasks of the task with the subtasks provided in subtasks_data.
+        Reconciles the subtasks of the task with the subtasks provided in subtasks_data.
 
-        First deletes any existing subtasks, then creates new Subtask objects for each
-        subtask dictionary in subtasks_data.
+        Each subtask dictionary is matched to an existing subtask by its id, or else
+        by its text. Matched subtasks are only updated if they changed, unmatched
+        ones are created and existing subtasks without a match are deleted and get
+        a tombstone. Subtask ids therefore stay stable across updates. The subtask
+        counters of the task are adjusted by the differences.
         """
-        Subtask.objects.filter(task=task).delete()
-        Subtask.objects.bulk_create([
-            Subtask(task=task, **subtask_data) for subtask_data in subtasks_data
-        ])
\ No newline at end of file
+        existing = {subtask.id: subtask for subtask in task.subtasks.all()}
+        requested_ids = {data.get('id') for data in subtasks_data}
+        by_text = {}
+        for subtask in existing.values():
+            if subtask.id not in requested_ids:
+                by_text.setdefault(subtask.subtasktext, []).append(subtask)
+
+        matched, changed, created = set(), [], []
+        done = 0
+        for data in subtasks_data:
+            data = dict(data)
+            subtask = existing.get(data.pop('id', None))
+            if subtask is None or subtask.id in matched:
+                candidates = by_text.get(data.get('subtasktext'))
+                subtask = candidates.pop(0) if candidates else None
+
+            if subtask is None:
+                created.append(Subtask(task=task, **data))
+                done += created[-1].checked
+                continue
+
+            matched.add(subtask.id)
+            done += data.get('checked', subtask.checked) - subtask.checked
+            if any(getattr(subtask, attr) != value for attr, value in data.items()):
+                for attr, value in data.items():
+                    setattr(subtask, attr, value)
+                subtask.updated_at = now()
+                changed.append(subtask)
+
+        deleted_ids = [subtask_id for subtask_id in existing if subtask_id not in matched]
+        done -= sum(existing[subtask_id].checked for subtask_id in deleted_ids)
+        if deleted_ids:
+            record_tombstones(task.created_by_id, Tombstone.SUBTASK, deleted_ids)
+            Subtask.objects.filter(id__in=deleted_ids).delete()
+        if changed:
+            Subtask.objects.bulk_update(changed, ['subtasktext', 'checked', 'updated_at'])
+        Subtask.objects.bulk_create(created)
+        adjust_subtask_counters(task, total=len(created) - len(deleted_ids), done=done)
+        publish_event(task.created_by_id, 'subtask', 'saved', [subtask.pk for subtask in changed + created])
+
+class CompactTaskSerializer(TaskSerializer):
+    subtasks = None
+
+    class Meta(TaskSerializer.Meta):
+        fields = tuple(field for field in TaskSerializer.Meta.fields if field != 'subtasks')
+
+class ArchivedSubtaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedSubtask
+        fields = ('id', 'subtasktext', 'checked')
+
+class ArchivedTaskUserDetailsSerializer(serializers.ModelSerializer):
+    user = CustomUserSerializer()
+
+    class Meta:
+        model = ArchivedTaskUserDetails
+        fields = ('user', 'checked')
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    user = ArchivedTaskUserDetailsSerializer(source='user_statuses', many=True, read_only=True)
+    subtasks = ArchivedSubtaskSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = (
+            'cardId', 'title', 'description', 'date', 'priority', 'category', 'status', 'version', 'user', 'subtasks',
+            'archived_at'
+        )
+        read_only_fields = fields
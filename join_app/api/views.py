@@ -1,14 +1,63 @@
+import asyncio
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.db.models import BooleanField, Case, CharField, Count, F, Min, Prefetch, Q, Value, When
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, localdate, make_aware, now
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .serializers import ContactSerializer, TaskSerializer, SubtaskSerializer
-from ..models import Contact, Task, Subtask
+from rest_framework.views import APIView
+from rest_framework.exceptions import AuthenticationFailed
+from user_auth_app.api.activity import activity_tracker
+from user_auth_app.api.authentication import CachedTokenAuthentication
+from .events import format_event, get_broker, publish_event
+from .board import BoardVersionMixin, bump_board_version, get_board_version
+from .counters import adjust_subtask_counters
+from .fast_serializers import (
+    CompiledListMixin, compact_task_serializer, contact_serializer, subtask_serializer, task_serializer
+)
+from .pagination import KeysetPagination, RequiredKeysetPagination
+from .search import search_task_ids
+from .serializers import (
+    MAX_SUBTASKS, ArchivedTaskSerializer, CompactTaskSerializer, ContactSerializer, TaskSerializer, SubtaskSerializer, SubtaskToggleSerializer, TaskMoveSerializer,
+    TaskStatusSerializer
+)
+from ..models import ArchivedTask, ArchivedTaskUserDetails, Contact, Task, Subtask, TaskUserDetails, Tombstone
 from rest_framework.exceptions import ValidationError
 
-class ContactList(generics.ListCreateAPIView):
+def get_board_queryset(user, subtasks=True):
+    """
+    Returns a queryset of Task objects created by the given user, with the
+    assigned users and, unless ``subtasks`` is False, the subtasks prefetched.
+
+    Serializing the board therefore takes a fixed number of queries, independent
+    of the number of tasks.
+    """
+    tasks = Task.objects.filter(created_by=user).prefetch_related(
+        Prefetch('user_statuses', queryset=TaskUserDetails.objects.select_related('user'))
+    )
+    return tasks.prefetch_related('subtasks') if subtasks else tasks
+
+
+def is_compact(request):
+    """
+    Returns True if the request asks for the compact task list with
+    ``?compact=1``, which contains the subtask counters instead of the subtasks.
+    """
+    return request.GET.get('compact', '').lower() in ('1', 'true')
+
+class ContactList(BoardVersionMixin, CompiledListMixin, generics.ListCreateAPIView):
     serializer_class = ContactSerializer
+    compiled_serializer = contact_serializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_orderings = {'id': ('id',)}
 
     def get_queryset(self):
         """
@@ -29,8 +78,9 @@ class ContactList(generics.ListCreateAPIView):
         except ValidationError as e:
             print("Validation Error Details:", e.detail)
             raise Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        bump_board_version(self.request.user.pk)
 
-class ContactDetail(generics.RetrieveUpdateDestroyAPIView):
+class ContactDetail(BoardVersionMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
@@ -42,9 +92,12 @@ class ContactDetail(generics.RetrieveUpdateDestroyAPIView):
         """
         return Contact.objects.filter(user=self.request.user)
 
-class TaskList(generics.ListCreateAPIView):
+class TaskList(BoardVersionMixin, CompiledListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
+    compiled_serializer = task_serializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_orderings = {'cardId': ('cardId',), 'date': ('date', 'cardId')}
 
     def get_queryset(self):
         """
@@ -53,10 +106,23 @@ class TaskList(generics.ListCreateAPIView):
         
         If the user is a guest, only returns tasks created by the user.
         """
-        user = self.request.user
-        if user.is_guest:
-            return Task.objects.filter(created_by=user)
-        return Task.objects.filter(created_by=user)
+        return get_board_queryset(self.request.user, subtasks=not is_compact(self.request))
+
+    def get_serializer_class(self):
+        """
+        Returns the compact serializer without subtasks for ``?compact=1`` lists.
+        """
+        if self.request.method == 'GET' and is_compact(self.request):
+            return CompactTaskSerializer
+        return super().get_serializer_class()
+
+    def get_compiled_serializer(self):
+        """
+        Returns the compiled serializer matching ``get_serializer_class()``.
+        """
+        if is_compact(self.request):
+            return compact_task_serializer
+        return super().get_compiled_serializer()
 
     def perform_create(self, serializer):
         """
@@ -67,8 +133,9 @@ class TaskList(generics.ListCreateAPIView):
 
         """
         serializer.save(created_by=self.request.user)
+        bump_board_version(self.request.user.pk)
 
-class TaskDetail(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetail(BoardVersionMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'cardId'
@@ -80,38 +147,220 @@ class TaskDetail(generics.RetrieveUpdateDestroyAPIView):
 
         Only returns tasks created by the user.
         """
-        return Task.objects.filter(created_by=self.request.user)
+        return get_board_queryset(self.request.user)
     
     def patch(self, request, *args, **kwargs):
         """
         Partially updates a task.
 
-        If the request data contains a 'status' key, the task's status is
-        updated to the provided value. If the 'status' key is present but has
-        no value, a 400 Bad Request response is returned.
+        If the request data contains a 'status' key, only the task's status is
+        updated to the provided value, see ``update_status()``. If the 'status'
+        key is present but has no value, a 400 Bad Request response is returned.
 
         If the request data does not contain a 'status' key, the task is updated
         as per the standard Django Rest Framework partial update implementation.
 
         """
-        instance = self.get_object()
         if 'status' in request.data:
-            status_value = request.data.get('status')
-            if not status_value:
+            if not request.data.get('status'):
                 return Response(
                     {"error": "Status field is required"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            instance.status = status_value
-            instance.save()
+            serializer = TaskStatusSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            data = serializer.validated_data
+            return self.update_status(request, data['status'], data.get('version'))
+
+        return super().partial_update(request, *args, **kwargs)
+
+    def update_status(self, request, status_value, version=None):
+        """
+        Changes the status of the task with a single UPDATE, without loading it.
+
+        If the client sends the version of the task it has seen, the update only
+        succeeds if the task was not changed in the meantime (optimistic
+        concurrency). Returns a 200 OK response with the new version, a 404 Not
+        Found response if the task does not exist, or a 409 Conflict response with
+        the current version if the task was changed by another request.
+
+        :param status_value: The new status
+        :param version: The version of the task the change is based on
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        card_id = self.kwargs['cardId']
+        tasks = Task.objects.filter(cardId=card_id, created_by=request.user)
+        expected = tasks if version is None else tasks.filter(version=version)
+
+        with transaction.atomic():
+            if not expected.update(status=status_value, version=F('version') + 1, updated_at=now()):
+                current_version = tasks.values_list('version', flat=True).first()
+                if current_version is None:
+                    raise Http404(f"No {Task._meta.object_name} matches the given query.")
+                return Response(
+                    {"error": "Task was changed by another request", "version": current_version},
+                    status=status.HTTP_409_CONFLICT
+                )
+            new_version = version + 1 if version is not None else tasks.values_list('version', flat=True).first()
+            bump_board_version(request.user.pk)
+            publish_event(request.user.pk, 'task', 'saved', [card_id])
+
+        return Response(
+            {"message": "Status updated successfully", "status": status_value, "version": new_version}
+        )
+
+class TaskBulkMove(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Changes the status of many tasks at once, e.g. after reorganising the
+        kanban board.
+
+        Expects a JSON list of objects with the keys 'cardId' and 'status'. In a
+        single transaction, the tasks are locked and their ownership is checked
+        with one query, and all statuses are changed with one UPDATE.
+
+        Returns a 200 OK response with the new board version, or a 400 Bad Request
+        response if the data is invalid, lists a task twice or contains tasks that
+        do not belong to the user.
+
+        :param request: The request object
+        :type request: rest_framework.request.Request
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        serializer = TaskMoveSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        counts = Counter(move['cardId'] for move in serializer.validated_data)
+        duplicate_ids = [card_id for card_id, count in counts.items() if count > 1]
+        if duplicate_ids:
             return Response(
-                {"message": "Status updated successfully", "status": instance.status}
+                {"error": "Duplicate task IDs", "cardIds": sorted(duplicate_ids)},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        
-        return super().partial_update(request, *args, **kwargs)
 
-class SubtaskList(generics.ListCreateAPIView):
+        moves = {move['cardId']: move['status'] for move in serializer.validated_data}
+        if not moves:
+            return Response({"updated": 0, "version": get_board_version(request.user.pk)})
+
+        with transaction.atomic():
+            tasks = Task.objects.filter(created_by=request.user, cardId__in=moves)
+            invalid_ids = set(moves).difference(tasks.select_for_update().values_list('cardId', flat=True))
+            if invalid_ids:
+                return Response(
+                    {"error": "Invalid task IDs", "cardIds": sorted(invalid_ids)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            updated = tasks.update(
+                status=Case(
+                    *[When(cardId=card_id, then=Value(status_value)) for card_id, status_value in moves.items()],
+                    output_field=CharField()
+                ),
+                version=F('version') + 1,
+                updated_at=now()
+            )
+            version = bump_board_version(request.user.pk)
+            publish_event(request.user.pk, 'task', 'saved', moves)
+
+        return Response({"updated": updated, "version": version})
+
+class TaskSummary(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Returns the figures of the summary screen for the tasks of the current user:
+        the total number of tasks, the number of tasks per status, the number of
+        urgent tasks and the next upcoming due date of a task that is not done.
+
+        The figures are computed with one grouped aggregate query and cached per
+        board version and day, so any write to the board invalidates them and the
+        upcoming deadline moves on at midnight.
+
+        :param request: The request object
+        :type request: rest_framework.request.Request
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        version = get_board_version(request.user.pk)
+        cache_key = f"task-summary:{request.user.pk}:{version}:{localdate().isoformat()}"
+        summary = cache.get(cache_key)
+
+        if summary is None:
+            summary = self.get_summary(request.user)
+            cache.set(cache_key, summary, settings.TASK_SUMMARY_CACHE_TIMEOUT)
+
+        return Response({**summary, "version": version})
+
+    def get_summary(self, user):
+        """
+        Computes the summary figures with one query grouped by status.
+
+        :rtype: dict
+        """
+        rows = Task.objects.filter(created_by=user).values('status').annotate(
+            count=Count('cardId'),
+            urgent=Count('cardId', filter=Q(priority__iexact='urgent')),
+            upcoming=Min('date', filter=Q(date__gte=localdate()) & ~Q(status='done')),
+        ).order_by()
+
+        upcoming_dates = [row['upcoming'] for row in rows if row['upcoming']]
+        return {
+            "total": sum(row['count'] for row in rows),
+            "status": {row['status']: row['count'] for row in rows},
+            "urgent": sum(row['urgent'] for row in rows),
+            "upcoming_deadline": min(upcoming_dates).isoformat() if upcoming_dates else None,
+        }
+
+class TaskSearch(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Searches the tasks of the current user for the words in the 'q' query
+        parameter.
+
+        Title, description and subtasks are searched with the full-text index and
+        the matching tasks are returned best match first, at most
+        ``TASK_SEARCH_LIMIT`` of them. An empty query returns an empty list.
+
+        :param request: The request object
+        :type request: rest_framework.request.Request
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        task_ids = search_task_ids(request.user, request.query_params.get('q', ''), settings.TASK_SEARCH_LIMIT)
+        tasks = task_serializer.serialize(Task.objects.filter(created_by=request.user, cardId__in=task_ids))
+        rank = {task_id: index for index, task_id in enumerate(task_ids)}
+        return Response(sorted(tasks, key=lambda task: rank[task['cardId']]))
+
+class ArchivedTaskList(BoardVersionMixin, generics.ListAPIView):
+    serializer_class = ArchivedTaskSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = RequiredKeysetPagination
+    keyset_orderings = {'cardId': ('cardId',), 'date': ('date', 'cardId')}
+
+    def get_queryset(self):
+        """
+        Returns a queryset of the archived tasks of the user of the current request,
+        with the assigned users and the subtasks prefetched.
+
+        The list is always paginated, since the archive keeps growing.
+        """
+        return ArchivedTask.objects.filter(created_by=self.request.user).prefetch_related(
+            Prefetch('user_statuses', queryset=ArchivedTaskUserDetails.objects.select_related('user')),
+            'subtasks'
+        )
+
+class SubtaskList(BoardVersionMixin, CompiledListMixin, generics.ListCreateAPIView):
     serializer_class = SubtaskSerializer
+    compiled_serializer = subtask_serializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -138,7 +387,11 @@ class SubtaskList(generics.ListCreateAPIView):
 
         """
         task = self._get_task()
-        serializer.save(task=task)
+        check_subtask_limit(task, 1)
+        with transaction.atomic():
+            subtask = serializer.save(task=task)
+            adjust_subtask_counters(task, total=1, done=int(subtask.checked))
+        bump_board_version(self.request.user.pk)
 
     def _get_task(self):
         """
@@ -151,11 +404,152 @@ class SubtaskList(generics.ListCreateAPIView):
         user = self.request.user
         return get_object_or_404(Task, cardId=task_id, created_by=user)
 
-class SubtaskDetail(generics.RetrieveUpdateDestroyAPIView):
+def check_subtask_limit(task, added):
+    """
+    Checks with one count query that the task has room for the given number of
+    new subtasks.
+
+    :raises: ValidationError if the task would have more than ``MAX_SUBTASKS``
+        subtasks
+    """
+    if Subtask.objects.filter(task=task).count() + added > MAX_SUBTASKS:
+        raise ValidationError({"subtasks": [f"maximum {MAX_SUBTASKS} subtasks."]})
+
+class SubtaskBatch(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, cardId):
+        """
+        Creates many subtasks of a task at once.
+
+        Expects a JSON list of subtasks with the keys 'subtasktext' and optionally
+        'checked'. The task is checked once and all subtasks are created with one
+        INSERT in a single transaction, as long as the task keeps at most
+        ``MAX_SUBTASKS`` subtasks.
+
+        Returns a 201 Created response with the created subtasks, a 400 Bad Request
+        response if the data is invalid or the limit is exceeded, or a 404 Not
+        Found response if the task does not belong to the user.
+
+        :param request: The request object
+        :type request: rest_framework.request.Request
+        :param cardId: The id of the task
+        :type cardId: int
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        serializer = SubtaskSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            task = self._get_task(cardId)
+            check_subtask_limit(task, len(serializer.validated_data))
+            subtasks = Subtask.objects.bulk_create([
+                Subtask(task=task, **data) for data in serializer.validated_data
+            ])
+            if subtasks:
+                adjust_subtask_counters(
+                    task, total=len(subtasks), done=sum(subtask.checked for subtask in subtasks)
+                )
+                bump_board_version(request.user.pk)
+                publish_event(request.user.pk, 'subtask', 'saved', [subtask.pk for subtask in subtasks])
+
+        return Response(SubtaskSerializer(subtasks, many=True).data, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, cardId):
+        """
+        Checks or unchecks many subtasks of a task at once.
+
+        Expects a JSON list of objects with the keys 'id' and 'checked'. The task
+        and its subtasks are checked with one query and all subtasks are updated
+        with one UPDATE in a single transaction.
+
+        Returns a 200 OK response with the number of updated subtasks and the new
+        board version, a 400 Bad Request response if the data is invalid or
+        contains subtasks of other tasks, or a 404 Not Found response if the task
+        does not belong to the user.
+
+        :param request: The request object
+        :type request: rest_framework.request.Request
+        :param cardId: The id of the task
+        :type cardId: int
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        serializer = SubtaskToggleSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        toggles = {toggle['id']: toggle['checked'] for toggle in serializer.validated_data}
+        with transaction.atomic():
+            task = self._get_task(cardId)
+            if not toggles:
+                return Response({"updated": 0, "version": get_board_version(request.user.pk)})
+
+            subtasks = Subtask.objects.filter(task=task, id__in=toggles)
+            current = dict(subtasks.values_list('id', 'checked'))
+            invalid_ids = set(toggles).difference(current)
+            if invalid_ids:
+                return Response(
+                    {"error": "Invalid subtask IDs", "ids": sorted(invalid_ids)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            updated = subtasks.update(
+                checked=Case(
+                    *[When(id=subtask_id, then=Value(checked)) for subtask_id, checked in toggles.items()],
+                    output_field=BooleanField()
+                ),
+                updated_at=now()
+            )
+            adjust_subtask_counters(task, done=sum(toggles.values()) - sum(current.values()))
+            version = bump_board_version(request.user.pk)
+            publish_event(request.user.pk, 'subtask', 'saved', toggles)
+
+        return Response({"updated": updated, "version": version})
+
+    def _get_task(self, card_id):
+        """
+        Returns the task of the user of the current request with the given id,
+        locked for the rest of the transaction where the database supports it.
+
+        :raises: Http404 if the task does not exist
+        """
+        return get_object_or_404(Task.objects.select_for_update(), cardId=card_id, created_by=self.request.user)
+
+class SubtaskDetail(BoardVersionMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = SubtaskSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
 
+    def get_queryset(self):
+        """
+        Returns a queryset of the subtasks of the task identified by the 'cardId'
+        URL parameter, if the task was created by the user of the current request.
+        """
+        return Subtask.objects.select_related('task').filter(
+            task__cardId=self.kwargs.get('cardId'), task__created_by=self.request.user
+        )
+
+    def perform_update(self, serializer):
+        """
+        Updates the subtask and adjusts the done counter of its task if the
+        subtask was checked or unchecked.
+        """
+        was_checked = serializer.instance.checked
+        with transaction.atomic():
+            super().perform_update(serializer)
+            adjust_subtask_counters(serializer.instance.task, done=int(serializer.instance.checked) - int(was_checked))
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the subtask and decrements the subtask counters of its task.
+        """
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            adjust_subtask_counters(instance.task, total=-1, done=-int(instance.checked))
+
     def patch(self, request, *args, **kwargs):
         """
         Partially updates a subtask.
@@ -170,10 +564,14 @@ class SubtaskDetail(generics.RetrieveUpdateDestroyAPIView):
         """
         task = self._get_task()
         subtask = self._get_subtask(task)
+        was_checked = subtask.checked
         serializer = self.serializer_class(subtask, data=request.data, partial=True)
 
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
+                adjust_subtask_counters(task, done=int(subtask.checked) - int(was_checked))
+            bump_board_version(request.user.pk)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -196,4 +594,129 @@ class SubtaskDetail(generics.RetrieveUpdateDestroyAPIView):
         """
         subtask_id = self.kwargs.get('id')
         user = self.request.user
-        return get_object_or_404(Subtask, id=subtask_id, task=task)
\ No newline at end of file
+        return get_object_or_404(Subtask, id=subtask_id, task=task)
+
+class BoardSync(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Returns the changes to the board of the current user since the cursor given
+        in the 'since' query parameter.
+
+        The response contains the created or updated tasks, subtasks and contacts,
+        the ids of deleted objects and a new cursor for the next request. Without
+        a cursor, all tasks (with their subtasks) and contacts are returned.
+
+        Returns a 400 Bad Request response if the cursor is invalid, or a 410 Gone
+        response if it is older than the tombstone retention and the client has to
+        load the whole board again.
+
+        :param request: The request object
+        :type request: rest_framework.request.Request
+        :return: A response object
+        :rtype: rest_framework.response.Response
+        """
+        user = request.user
+        current_time = now()
+        since = request.query_params.get('since')
+
+        tasks = get_board_queryset(user)
+        contacts = Contact.objects.filter(user=user)
+        data = {
+            'cursor': (current_time - timedelta(seconds=settings.SYNC_CURSOR_OVERLAP)).isoformat(),
+            'subtasks': [],
+            'deleted': {Tombstone.TASK: [], Tombstone.SUBTASK: [], Tombstone.CONTACT: []},
+        }
+
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+            if is_naive(since):
+                since = make_aware(since)
+            if since < current_time - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+                return Response({"error": "Cursor expired, full sync required"}, status=status.HTTP_410_GONE)
+
+            tasks = tasks.filter(updated_at__gt=since)
+            contacts = contacts.filter(updated_at__gt=since)
+            subtasks = Subtask.objects.filter(task__created_by=user, updated_at__gt=since)
+            data['subtasks'] = subtask_serializer.serialize(subtasks)
+
+            tombstones = Tombstone.objects.filter(user=user, deleted_at__gt=since)
+            for model, object_id in tombstones.values_list('model', 'object_id'):
+                data['deleted'][model].append(object_id)
+
+        data['tasks'] = task_serializer.serialize(tasks)
+        data['contacts'] = contact_serializer.serialize(contacts)
+        return Response(data)
+
+def get_token_key(request):
+    """
+    Returns the token key from the 'Authorization: Token <key>' header or, since
+    browsers cannot set headers for EventSource connections, from the 'token'
+    query parameter.
+
+    :rtype: str
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0].lower() == 'token':
+        return header[1]
+    return request.GET.get('token')
+
+async def board_events(request):
+    """
+    Streams the changes to the board of the current user as Server-Sent Events.
+
+    Each event names the type ('task', 'subtask' or 'contact'), the action
+    ('saved' or 'deleted') and the ids of the changed objects, so the client can
+    load them with the sync endpoint instead of polling the whole board. A
+    'resync' event asks the client to run a sync because events were dropped.
+
+    Every ``BOARD_EVENTS_HEARTBEAT`` seconds without events a comment is sent and
+    the token is checked again and renewed, so an open stream counts as
+    activity. The stream ends once the token is no longer valid.
+
+    Needs an ASGI server, e.g. ``uvicorn join_backend_django.asgi:application``.
+
+    :param request: The request object
+    :type request: django.http.HttpRequest
+    :return: A streaming response or a 401 Unauthorized response
+    :rtype: django.http.HttpResponse
+    """
+    authenticate = CachedTokenAuthentication().aauthenticate_credentials
+    key = get_token_key(request)
+    if not key:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    try:
+        user, _ = await authenticate(key)
+    except AuthenticationFailed as e:
+        return JsonResponse({"detail": e.detail}, status=401)
+
+    async def stream():
+        broker = get_broker()
+        queue = broker.subscribe(user.pk)
+        try:
+            yield f"retry: {settings.BOARD_EVENTS_RETRY}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.BOARD_EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    try:
+                        await authenticate(key)
+                    except AuthenticationFailed:
+                        return
+                    await activity_tracker.atouch(user)
+                    yield ": heartbeat\n\n"
+                    continue
+                yield format_event(event)
+        finally:
+            broker.unsubscribe(user.pk, queue)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
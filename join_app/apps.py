@@ -1,5 +1,33 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+
+SEARCH_INDEX_MIGRATION = '0025_task_search'
 
 class JoinApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'join_app'
+
+    def ready(self):
+        """
+        Connects the signal handlers that publish board events, that invalidate
+        boards after profile changes of assignees and that repair the task
+        search index after migrations.
+        """
+        from .api import board, events  # noqa: F401
+        post_migrate.connect(repair_search_index, sender=self)
+
+
+def repair_search_index(sender, using, **kwargs):
+    """
+    Rebuilds the task search index after ``migrate`` with the live definitions
+    of ``join_app.api.search`` if a table rebuild dropped its triggers. Databases
+    migrated back to before the search index are left alone.
+    """
+    from .api.search import ensure_search_index
+    db = connections[using]
+    if (sender.label, SEARCH_INDEX_MIGRATION) not in MigrationRecorder(db).applied_migrations():
+        return
+    if ensure_search_index(db):
+        print("[Search] Rebuilt the task search index.")
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from join_app.api.archive import archive_done_tasks
+
+
+class Command(BaseCommand):
+    help = 'Moves completed tasks into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS,
+            help='Archive tasks that were last changed more than this many days ago.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.TASK_ARCHIVE_BATCH_SIZE,
+            help='Number of tasks to archive per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Archives all completed tasks older than ``--days`` and reports how many
+        were moved.
+        """
+        archived = archive_done_tasks(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} completed tasks."))
@@ -0,0 +1,69 @@
+import io
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from join_app.api.fast_serializers import task_serializer
+from join_app.api.parsers import FastJSONParser
+from join_app.api.renderers import FastJSONRenderer, orjson
+from join_app.api.views import get_board_queryset
+from .bench_serializers import create_board
+
+
+class Command(BaseCommand):
+    help = 'Compares the fast JSON renderer and parser with the ones of DRF on a generated board.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Number of tasks to generate.')
+        parser.add_argument('--repeat', type=int, default=10, help='Number of timed runs per variant.')
+
+    def handle(self, *args, **options):
+        """
+        Serializes a generated board inside a transaction that is rolled back
+        afterwards and reports the best time of rendering it to JSON, streaming it
+        in chunks and parsing it again, together with whether the outputs match.
+        """
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed, the fast classes use the standard library.'))
+
+        with transaction.atomic():
+            data = task_serializer.serialize(get_board_queryset(create_board(options['rows'])))
+            transaction.set_rollback(True)
+        data.append({'date': now(), 'deadline': now().date(), 'duration': timedelta(hours=1), 'cost': Decimal('1.50')})
+
+        repeat = options['repeat']
+        drf, drf_time = self.measure(lambda: JSONRenderer().render(data), repeat)
+        fast, fast_time = self.measure(lambda: FastJSONRenderer().render(data), repeat)
+        streamed, stream_time = self.measure(lambda: b''.join(FastJSONRenderer().iter_render(data)), repeat)
+        self.report('render', drf_time, fast_time, drf == fast)
+        self.report('stream', drf_time, stream_time, drf == streamed)
+
+        parsed, parse_time = self.measure(lambda: JSONParser().parse(io.BytesIO(drf)), repeat)
+        fast_parsed, fast_parse_time = self.measure(lambda: FastJSONParser().parse(io.BytesIO(drf)), repeat)
+        self.report('parse', parse_time, fast_parse_time, parsed == fast_parsed)
+        self.stdout.write(f"payload   {len(drf) / 1024:.0f} KiB, {len(data)} items")
+
+    def measure(self, run, repeat):
+        """
+        Returns the result and the best time of ``repeat`` runs.
+        """
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    def report(self, name, drf_time, fast_time, identical):
+        """
+        Writes one line of the comparison.
+        """
+        self.stdout.write(
+            f"{name:<9} DRF {drf_time * 1000:7.2f} ms   fast {fast_time * 1000:7.2f} ms   "
+            f"speedup {drf_time / fast_time:5.1f}x   identical: {identical}"
+        )
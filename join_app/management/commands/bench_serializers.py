@@ -0,0 +1,88 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from user_auth_app.api.serializers import CustomUserSerializer
+from user_auth_app.models import CustomUser
+from join_app.api.fast_serializers import contact_serializer, subtask_serializer, task_serializer, user_serializer
+from join_app.api.serializers import ContactSerializer, SubtaskSerializer, TaskSerializer
+from join_app.api.views import get_board_queryset
+from join_app.models import Contact, Subtask, Task, TaskUserDetails
+
+
+def create_board(rows):
+    """
+    Creates a user with ``rows`` tasks, each with two assigned users and two
+    subtasks, and ``rows`` contacts.
+
+    :return: The owner of the board
+    :rtype: CustomUser
+    """
+    owner = CustomUser.objects.create_user(username='benchowner', email='bench-owner@example.com')
+    assignees = CustomUser.objects.bulk_create([
+        CustomUser(username=f'benchuser{i}', email=f'bench-user{i}@example.com') for i in range(2)
+    ])
+    tasks = Task.objects.bulk_create([
+        Task(title=f'Task {i}', description='Benchmark task', date='2024-12-24', priority='medium',
+             category='Technical Task', status='todo', created_by=owner)
+        for i in range(rows)
+    ])
+    TaskUserDetails.objects.bulk_create([
+        TaskUserDetails(task=task, user=user, checked=True) for task in tasks for user in assignees
+    ])
+    Subtask.objects.bulk_create([
+        Subtask(task=task, subtasktext=f'Subtask {i}') for task in tasks for i in range(2)
+    ])
+    Contact.objects.bulk_create([
+        Contact(name=f'Contact {i}', email=f'contact{i}@example.com', phone='+49 123456',
+                emblem='C', color='#ff0000', user=owner)
+        for i in range(rows)
+    ])
+    return owner
+
+
+class Command(BaseCommand):
+    help = 'Compares the DRF serializers with the compiled serializers on generated data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Number of tasks and contacts to generate.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per serializer.')
+
+    def handle(self, *args, **options):
+        """
+        Generates a board inside a transaction that is rolled back afterwards,
+        serializes it with both serializers and reports the best time of each run
+        and whether the rendered JSON is identical.
+        """
+        with transaction.atomic():
+            owner = create_board(options['rows'])
+            benchmarks = [
+                ('tasks', TaskSerializer, task_serializer, lambda: get_board_queryset(owner)),
+                ('subtasks', SubtaskSerializer, subtask_serializer,
+                 lambda: Subtask.objects.filter(task__created_by=owner)),
+                ('contacts', ContactSerializer, contact_serializer, lambda: Contact.objects.filter(user=owner)),
+                ('users', CustomUserSerializer, user_serializer, lambda: CustomUser.objects.filter(is_guest=False)),
+            ]
+            for name, serializer_class, compiled, get_queryset in benchmarks:
+                drf_json, drf_time = self.measure(
+                    lambda: serializer_class(get_queryset(), many=True).data, options['repeat'])
+                compiled_json, compiled_time = self.measure(
+                    lambda: compiled.serialize(get_queryset()), options['repeat'])
+                self.stdout.write(
+                    f"{name:<9} DRF {drf_time * 1000:8.1f} ms   compiled {compiled_time * 1000:8.1f} ms   "
+                    f"speedup {drf_time / compiled_time:5.1f}x   identical: {drf_json == compiled_json}"
+                )
+            transaction.set_rollback(True)
+
+    def measure(self, serialize, repeat):
+        """
+        Returns the rendered JSON and the best time of ``repeat`` runs, including
+        the queries.
+        """
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = serialize()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return JSONRenderer().render(data), best
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from join_app.api.counters import repair_subtask_counters
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the subtask counters of tasks whose counters have drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of tasks to repair per UPDATE.')
+
+    def handle(self, *args, **options):
+        """
+        Repairs all drifted subtask counters and reports how many tasks were fixed.
+        """
+        repaired = repair_subtask_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Repaired the subtask counters of {repaired} tasks."))
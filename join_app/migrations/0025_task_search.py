@@ -0,0 +1,26 @@
+from django.db import migrations
+from join_app.search_index_v1 import drop_search_index, rebuild_search_index
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Creates the FTS5 index of tasks and subtasks and the triggers that keep it in
+    sync. Only SQLite builds with FTS5 support get the index, the search falls
+    back to LIKE queries everywhere else.
+    """
+    rebuild_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('join_app', '0024_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:40
+
+from django.db import migrations, models
+from join_app.search_index_v1 import rebuild_search_index
+
+
+def restore_search_index(apps, schema_editor):
+    """
+    Recreates the task search index, whose triggers SQLite drops when the task
+    table is rebuilt for the new column.
+    """
+    rebuild_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('join_app', '0025_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:49
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('join_app', '0026_task_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSubtask',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('subtasktext', models.CharField(max_length=100)),
+                ('checked', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('cardId', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('date', models.DateField()),
+                ('priority', models.CharField(blank=True, max_length=20)),
+                ('category', models.CharField(max_length=100)),
+                ('status', models.CharField(max_length=20)),
+                ('updated_at', models.DateTimeField()),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTaskUserDetails',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'updated_at'], name='join_app_ta_status_433026_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='created_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedsubtask',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to='join_app.archivedtask'),
+        ),
+        migrations.AddField(
+            model_name='archivedtaskuserdetails',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_statuses', to='join_app.archivedtask'),
+        ),
+        migrations.AddField(
+            model_name='archivedtaskuserdetails',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['created_by', 'date'], name='join_app_ar_created_2b5b66_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:51
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from join_app.search_index_v1 import rebuild_search_index
+
+
+def count_subtasks(Subtask, **filters):
+    subtasks = Subtask.objects.filter(task=OuterRef('pk'), **filters).order_by().values('task')
+    return Coalesce(Subquery(subtasks.annotate(count=Count('pk')).values('count')), 0, output_field=IntegerField())
+
+
+def fill_subtask_counters(apps, schema_editor):
+    """
+    Sets the subtask counters of the existing tasks with one UPDATE.
+    """
+    Task = apps.get_model('join_app', 'Task')
+    Subtask = apps.get_model('join_app', 'Subtask')
+    Task.objects.update(
+        subtasks_total=count_subtasks(Subtask),
+        subtasks_done=count_subtasks(Subtask, checked=True)
+    )
+
+
+def restore_search_index(apps, schema_editor):
+    """
+    Recreates the task search index, whose triggers SQLite drops when the task
+    table is rebuilt for the new columns.
+    """
+    rebuild_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('join_app', '0027_task_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='subtasks_done',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtasks_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_subtask_counters, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
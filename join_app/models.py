@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from user_auth_app.models import CustomUser
 from django.core.exceptions import ValidationError
 from user_auth_app.api.validators import validate_username_format, validate_phone_format
@@ -19,6 +20,13 @@ class Contact(models.Model):
     emblem = models.CharField(max_length=100)
     color = models.CharField(max_length=100)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='contacts')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'email']),
+            models.Index(fields=['user', 'updated_at']),
+        ]
 
     def clean(self):
         """
@@ -61,6 +69,18 @@ class Task(models.Model):
         through='TaskUserDetails',
         related_name='tasks'
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=0)
+    subtasks_total = models.PositiveIntegerField(default=0)
+    subtasks_done = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', 'status']),
+            models.Index(fields=['created_by', 'date']),
+            models.Index(fields=['created_by', 'updated_at']),
+            models.Index(fields=['status', 'updated_at']),
+        ]
 
     def __str__(self):
         """
@@ -92,6 +112,7 @@ class Subtask(models.Model):
     subtasktext = models.CharField(max_length=100)
     checked = models.BooleanField(default=False)
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='subtasks')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         """
@@ -102,4 +123,89 @@ class Subtask(models.Model):
         :return: A string representation of the Subtask instance
         :rtype: str
         """
-        return f"{self.subtasktext} (Checked: {self.checked})"
\ No newline at end of file
+        return f"{self.subtasktext} (Checked: {self.checked})"
+
+class Tombstone(models.Model):
+    TASK = 'task'
+    SUBTASK = 'subtask'
+    CONTACT = 'contact'
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='tombstones')
+    model = models.CharField(max_length=10)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the Tombstone instance.
+
+        The string representation shows the model and the id of the deleted object.
+
+        :return: A string representation of the Tombstone instance
+        :rtype: str
+        """
+        return f"{self.model} {self.object_id} (Deleted: {self.deleted_at})"
+
+class ArchivedTask(models.Model):
+    cardId = models.IntegerField(primary_key=True)
+    title = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    date = models.DateField()
+    priority = models.CharField(max_length=20, blank=True)
+    category = models.CharField(max_length=100)
+    status = models.CharField(max_length=20)
+    created_by = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='archived_tasks'
+    )
+    updated_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', 'date']),
+        ]
+
+    def __str__(self):
+        """
+        Returns the title of the archived task as a string.
+
+        :return: The title of the archived task
+        :rtype: str
+        """
+        return self.title
+
+class ArchivedTaskUserDetails(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name='user_statuses')
+    checked = models.BooleanField(default=False)
+
+    def __str__(self):
+        """
+        Returns a string representation of the ArchivedTaskUserDetails instance.
+
+        :return: A string representation of the ArchivedTaskUserDetails instance
+        :rtype: str
+        """
+        return f"Archived task: {self.task_id}, User: {self.user_id}, Checked: {self.checked}"
+
+class ArchivedSubtask(models.Model):
+    id = models.IntegerField(primary_key=True)
+    subtasktext = models.CharField(max_length=100)
+    checked = models.BooleanField(default=False)
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name='subtasks')
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        """
+        Returns a string representation of the ArchivedSubtask instance.
+
+        :return: A string representation of the ArchivedSubtask instance
+        :rtype: str
+        """
+        return f"{self.subtasktext} (Checked: {self.checked})"
@@ -0,0 +1,99 @@
+"""
+Frozen copy of the task search index as created by migration 0025 and restored
+by the migrations that rebuild the task table.
+
+Migrations must behave the same no matter how the application code changes
+later, so this module is never edited. ``join_app.api.search`` holds the live
+definitions, which the ``post_migrate`` repair applies after every ``migrate``.
+A changed index gets a new module and a new migration.
+"""
+
+FTS_TABLE = 'join_app_task_fts'
+
+SUBTASK_TEXT = (
+    "(SELECT coalesce(group_concat(subtasktext, ' '), '') FROM join_app_subtask WHERE task_id = {task_id})"
+)
+
+CREATE_TABLE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, description, subtasks, created_by_id,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, title, description, subtasks, created_by_id)
+    SELECT t.cardId, t.title, t.description, {SUBTASK_TEXT.format(task_id='t.cardId')}, t.created_by_id
+    FROM join_app_task t
+    """,
+]
+
+TRIGGERS = {
+    'join_app_task_fts_insert': f"""
+    CREATE TRIGGER join_app_task_fts_insert AFTER INSERT ON join_app_task BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description, subtasks, created_by_id)
+        VALUES (new.cardId, new.title, new.description, '', new.created_by_id);
+    END
+    """,
+    'join_app_task_fts_update': f"""
+    CREATE TRIGGER join_app_task_fts_update AFTER UPDATE OF title, description, created_by_id ON join_app_task BEGIN
+        UPDATE {FTS_TABLE}
+        SET title = new.title, description = new.description, created_by_id = new.created_by_id
+        WHERE rowid = new.cardId;
+    END
+    """,
+    'join_app_task_fts_delete': f"""
+    CREATE TRIGGER join_app_task_fts_delete AFTER DELETE ON join_app_task BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.cardId;
+    END
+    """,
+    'join_app_subtask_fts_insert': f"""
+    CREATE TRIGGER join_app_subtask_fts_insert AFTER INSERT ON join_app_subtask BEGIN
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='new.task_id')}
+        WHERE rowid = new.task_id;
+    END
+    """,
+    'join_app_subtask_fts_update': f"""
+    CREATE TRIGGER join_app_subtask_fts_update AFTER UPDATE OF subtasktext, task_id ON join_app_subtask BEGIN
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='old.task_id')}
+        WHERE rowid = old.task_id;
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='new.task_id')}
+        WHERE rowid = new.task_id;
+    END
+    """,
+    'join_app_subtask_fts_delete': f"""
+    CREATE TRIGGER join_app_subtask_fts_delete AFTER DELETE ON join_app_subtask BEGIN
+        UPDATE {FTS_TABLE} SET subtasks = {SUBTASK_TEXT.format(task_id='old.task_id')}
+        WHERE rowid = old.task_id;
+    END
+    """,
+}
+
+
+def drop_search_index(db):
+    """
+    Drops the FTS5 index and its triggers.
+    """
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def rebuild_search_index(db):
+    """
+    Creates the FTS5 index from scratch, fills it with the existing tasks and
+    creates its triggers. Only SQLite builds with FTS5 support get the index.
+    """
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not cursor.fetchone()[0]:
+            return
+    drop_search_index(db)
+    with db.cursor() as cursor:
+        for sql in [*CREATE_TABLE_SQL, *TRIGGERS.values()]:
+            cursor.execute(sql)
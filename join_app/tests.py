@@ -1,3 +1,893 @@
-from django.test import TestCase
+import base64
+import gzip
+import json
+import re
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils.timezone import localdate, now
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from user_auth_app.api.authentication import token_cache
+from user_auth_app.models import CustomUser, ExpiringToken
+from user_auth_app.api.serializers import CustomUserSerializer
+from .api.async_views import AsyncContactDetail, AsyncContactList, AsyncTaskDetail, AsyncTaskList
+from .api.archive import archive_done_tasks, get_archivable_tasks
+from .api.counters import repair_subtask_counters
+from .api import middleware, search
+from .api.fast_serializers import (
+    compact_task_serializer, contact_serializer, subtask_serializer, task_serializer, user_serializer
+)
+from .api.renderers import FastJSONRenderer
+from .api.serializers import MAX_SUBTASKS, CompactTaskSerializer, ContactSerializer, SubtaskSerializer, TaskSerializer
+from .api.views import board_events, get_board_queryset
+from .models import ArchivedSubtask, ArchivedTask, Contact, Task, Subtask, TaskUserDetails, Tombstone
 
-# Create your tests here.
+
+class QueryBudgetMixin:
+    """
+    Asserts that an endpoint stays within a fixed number of queries while the
+    amount of data it returns grows.
+    """
+    data_sizes = (1, 10, 50)
+
+    def authenticate(self, user):
+        """
+        Authenticates the test client with a new token of the given user.
+        """
+        token = ExpiringToken.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def assertQueryBudget(self, url, max_queries, populate):
+        """
+        Calls ``populate(size)`` for every size in ``data_sizes`` and asserts that
+        a GET request to ``url`` afterwards takes at most ``max_queries`` queries.
+
+        The token cache is cleared before every request, so the token lookup is
+        always part of the budget.
+        """
+        for size in self.data_sizes:
+            populate(size)
+            token_cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(
+                len(queries), max_queries,
+                f"GET {url} with {size} items took {len(queries)} queries:\n"
+                + "\n".join(query['sql'] for query in queries.captured_queries)
+            )
+
+
+@override_settings(ACTIVITY_FLUSH_INTERVAL=3600)
+class QueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.authenticate(self.user)
+
+    def create_tasks(self, size):
+        """
+        Creates ``size`` tasks, each with two assigned users and two subtasks.
+        """
+        Task.objects.filter(created_by=self.user).delete()
+        assignees = [
+            CustomUser.objects.get_or_create(username=f'user{i}', email=f'user{i}@example.com')[0]
+            for i in range(2)
+        ]
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', date='2024-12-24', category='Technical Task', status='todo', created_by=self.user)
+            for i in range(size)
+        ])
+        TaskUserDetails.objects.bulk_create([
+            TaskUserDetails(task=task, user=user, checked=True) for task in tasks for user in assignees
+        ])
+        Subtask.objects.bulk_create([
+            Subtask(task=task, subtasktext=f'Subtask {i}') for task in tasks for i in range(2)
+        ])
+        return tasks
+
+    def test_task_list(self):
+        self.assertQueryBudget(reverse('task-list'), 5, self.create_tasks)
+
+    def test_task_detail(self):
+        task = self.create_tasks(1)[0]
+
+        def populate(size):
+            assignees = CustomUser.objects.bulk_create([
+                CustomUser(username=f'assignee{size}_{i}', email=f'assignee{size}_{i}@example.com')
+                for i in range(size)
+            ])
+            TaskUserDetails.objects.bulk_create([TaskUserDetails(task=task, user=user) for user in assignees])
+            Subtask.objects.bulk_create([Subtask(task=task, subtasktext='Subtask') for _ in range(size)])
+        self.assertQueryBudget(reverse('task-detail', kwargs={'cardId': task.cardId}), 5, populate)
+
+    def test_subtask_list(self):
+        task = self.create_tasks(1)[0]
+
+        def populate(size):
+            Subtask.objects.bulk_create([Subtask(task=task, subtasktext='Subtask') for _ in range(size)])
+        self.assertQueryBudget(reverse('task-subtask-list', kwargs={'cardId': task.cardId}), 4, populate)
+
+    def test_contact_list(self):
+        def populate(size):
+            Contact.objects.filter(user=self.user).delete()
+            Contact.objects.bulk_create([
+                Contact(name=f'Contact {i}', email=f'contact{i}@example.com', phone='+49 123456',
+                        emblem='C', color='#ff0000', user=self.user)
+                for i in range(size)
+            ])
+        self.assertQueryBudget(reverse('contact-list'), 3, populate)
+
+    def test_user_list(self):
+        def populate(size):
+            CustomUser.objects.bulk_create([
+                CustomUser(username=f'member{size}_{i}', email=f'member{size}_{i}@example.com')
+                for i in range(size)
+            ])
+        self.assertQueryBudget(reverse('customeruser-list'), 2, populate)
+
+
+class QueryPlanMixin:
+    """
+    Asserts that a queryset is answered with index lookups instead of full table scans.
+    """
+    full_scan = re.compile(r'\bSCAN \w+\b(?! USING (COVERING )?INDEX)')
+
+    def assertNoFullScan(self, queryset):
+        """
+        Runs ``EXPLAIN QUERY PLAN`` for the queryset and fails if SQLite scans a
+        whole table.
+        """
+        plan = queryset.explain()
+        scans = [match.group(0) for match in self.full_scan.finditer(plan)]
+        self.assertFalse(scans, f"Full table scan in query plan:\n{queryset.query}\n{plan}")
+
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+
+    def test_task_queries(self):
+        tasks = get_board_queryset(self.user)
+        self.assertNoFullScan(tasks)
+        self.assertNoFullScan(tasks.order_by('date', 'cardId'))
+        self.assertNoFullScan(tasks.filter(status='done'))
+        self.assertNoFullScan(tasks.filter(updated_at__gt=now()))
+        self.assertNoFullScan(TaskUserDetails.objects.select_related('user').filter(task__in=[1, 2]))
+        self.assertNoFullScan(Subtask.objects.filter(task__in=[1, 2]))
+        self.assertNoFullScan(Subtask.objects.filter(task__created_by=self.user, updated_at__gt=now()))
+
+    def test_task_summary_query(self):
+        self.assertNoFullScan(
+            Task.objects.filter(created_by=self.user).values('status').annotate(count=Count('cardId')).order_by()
+        )
+
+    def test_contact_queries(self):
+        contacts = Contact.objects.filter(user=self.user)
+        self.assertNoFullScan(contacts)
+        self.assertNoFullScan(contacts.filter(email='contact@example.com').exclude(id=1))
+        self.assertNoFullScan(contacts.filter(updated_at__gt=now()))
+        self.assertNoFullScan(CustomUser.objects.filter(email='contact@example.com'))
+
+    def test_user_queries(self):
+        self.assertNoFullScan(CustomUser.objects.filter(is_guest=True, last_activity__lt=now()))
+        self.assertNoFullScan(CustomUser.objects.filter(is_guest=True).filter(
+            Q(auth_token__isnull=True) | Q(auth_token__expires_at__lt=now())
+        ))
+        self.assertNoFullScan(ExpiringToken.objects.filter(expires_at__lt=now()))
+        self.assertNoFullScan(ExpiringToken.objects.filter(expires_at__isnull=True))
+
+    def test_sync_queries(self):
+        since = now() - timedelta(minutes=1)
+        self.assertNoFullScan(Tombstone.objects.filter(user=self.user, deleted_at__gt=since))
+
+    def test_archive_queries(self):
+        self.assertNoFullScan(get_archivable_tasks().order_by('cardId').values_list('cardId', flat=True))
+        archived = ArchivedTask.objects.filter(created_by=self.user)
+        self.assertNoFullScan(archived.order_by('cardId'))
+        self.assertNoFullScan(archived.order_by('date', 'cardId'))
+
+
+class CompiledSerializerTests(TestCase):
+    """
+    Checks that the compiled serializers render exactly the same JSON as the DRF
+    serializers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='owner', email='owner@example.com', color='#ff7a00')
+        cls.users = [
+            CustomUser.objects.create_user(username='Jürgen', email='juergen@example.com', emblem='JM', color=None),
+            CustomUser.objects.create_user(username='anna', email='anna@example.com', phone='+49 1234567'),
+        ]
+        CustomUser.objects.create_user(username='guest', email='guest@example.com', is_guest=True)
+        other = CustomUser.objects.create_user(username='other', email='other@example.com')
+
+        tasks = Task.objects.bulk_create([
+            Task(title='Kanban "Board"', description='Ümlaut & <html>', date='2024-12-24', priority='urgent',
+                 category='Technical Task', status='todo', created_by=cls.owner),
+            Task(title='No details', date='2025-01-01', category='User Story', status='done', version=3,
+                 created_by=cls.owner),
+            Task(title='Foreign', date='2025-01-01', category='User Story', status='todo', created_by=other),
+        ])
+        TaskUserDetails.objects.bulk_create([
+            TaskUserDetails(task=tasks[0], user=cls.users[0], checked=True),
+            TaskUserDetails(task=tasks[0], user=cls.users[1]),
+            TaskUserDetails(task=tasks[2], user=cls.owner),
+        ])
+        Subtask.objects.bulk_create([
+            Subtask(task=tasks[0], subtasktext='First', checked=True),
+            Subtask(task=tasks[0], subtasktext='Zweite Aufgabe'),
+            Subtask(task=tasks[2], subtasktext='Foreign'),
+        ])
+        Contact.objects.bulk_create([
+            Contact(name='Max Mustermann', email='max@example.com', phone='+49 123456', emblem='MM',
+                    color='#000000', user=cls.owner),
+            Contact(name='Émile', email='emile@example.com', phone='+33 123456', emblem='E',
+                    color='#ffffff', user=cls.owner),
+        ])
+
+    def assertSameJSON(self, drf_data, compiled_data):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(drf_data), renderer.render(compiled_data))
+
+    def test_tasks(self):
+        tasks = get_board_queryset(self.owner)
+        self.assertSameJSON(TaskSerializer(tasks, many=True).data, task_serializer.serialize(tasks))
+        tasks = Task.objects.all()
+        self.assertSameJSON(TaskSerializer(tasks, many=True).data, task_serializer.serialize(tasks))
+
+    def test_compact_tasks(self):
+        tasks = get_board_queryset(self.owner, subtasks=False)
+        self.assertSameJSON(CompactTaskSerializer(tasks, many=True).data, compact_task_serializer.serialize(tasks))
+
+    def test_empty_lists(self):
+        tasks = Task.objects.none()
+        self.assertSameJSON(TaskSerializer(tasks, many=True).data, task_serializer.serialize(tasks))
+
+    def test_subtasks(self):
+        subtasks = Subtask.objects.all()
+        self.assertSameJSON(SubtaskSerializer(subtasks, many=True).data, subtask_serializer.serialize(subtasks))
+
+    def test_contacts(self):
+        contacts = Contact.objects.filter(user=self.owner)
+        self.assertSameJSON(ContactSerializer(contacts, many=True).data, contact_serializer.serialize(contacts))
+
+    def test_users(self):
+        users = CustomUser.objects.filter(is_guest=False)
+        self.assertSameJSON(CustomUserSerializer(users, many=True).data, user_serializer.serialize(users))
+
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    Checks that the FastJSONRenderer renders exactly the same JSON as DRF's
+    JSONRenderer.
+    """
+    data = [
+        {
+            'datetime': datetime(2024, 12, 24, 18, 30, 15, 123456, tzinfo=timezone.utc),
+            'naive': datetime(2024, 12, 24, 18, 30),
+            'date': date(2024, 12, 24),
+            'time': time(9, 15, 30, 500),
+            'decimal': Decimal('12.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'text': 'Line\u2028separator\u2029 Ümlaut "quoted" <html>',
+            'big': 2 ** 70,
+        },
+        {1: 'integer key', None: 'null key'},
+        {'nested': [None, True, 1.5, {'empty': []}]},
+    ]
+
+    def test_render(self):
+        for data in [*self.data, self.data, [], None]:
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_iter_render(self):
+        renderer = FastJSONRenderer()
+        renderer.chunk_size = 2
+        items = self.data * 3
+        self.assertEqual(b''.join(renderer.iter_render(items)), JSONRenderer().render(items))
+        self.assertEqual(b''.join(renderer.iter_render([])), JSONRenderer().render([]))
+
+
+class TaskArchiveTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        for index, status in enumerate(['done', 'done', 'done', 'todo']):
+            task = Task.objects.create(
+                title=f'Task {index}', date='2024-01-01', category='Work', status=status, created_by=self.user
+            )
+            Subtask.objects.create(task=task, subtasktext=f'Subtask {index}')
+            TaskUserDetails.objects.create(task=task, user=self.user, checked=True)
+        self.old_ids = list(Task.objects.order_by('cardId').values_list('cardId', flat=True)[1:])
+        Task.objects.filter(cardId__in=self.old_ids).update(updated_at=now() - timedelta(days=60))
+
+    def test_archive_done_tasks(self):
+        self.assertEqual(archive_done_tasks(days=30, batch_size=1), 2)
+        archived_ids = self.old_ids[:2]
+        self.assertEqual(sorted(ArchivedTask.objects.values_list('cardId', flat=True)), archived_ids)
+        self.assertEqual(sorted(ArchivedSubtask.objects.values_list('task_id', flat=True)), archived_ids)
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(Subtask.objects.count(), 2)
+        self.assertEqual(TaskUserDetails.objects.count(), 2)
+        self.assertEqual(sorted(Tombstone.objects.values_list('object_id', flat=True)), archived_ids)
+        self.assertEqual(archive_done_tasks(days=30), 0)
+
+
+class SubtaskCounterTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title='Task', date='2024-01-01', category='Work', status='todo', created_by=self.user)
+
+    def assertCounters(self, total, done):
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.subtasks_total, self.task.subtasks_done), (total, done))
+
+    def test_subtask_endpoints(self):
+        url = reverse('task-subtask-list', args=[self.task.pk])
+        first = self.client.post(url, {'subtasktext': 'First', 'checked': True}, format='json').data['id']
+        self.client.post(url, {'subtasktext': 'Second'}, format='json')
+        self.assertCounters(2, 1)
+
+        self.client.patch(reverse('task-subtask-detail', args=[self.task.pk, first]), {'checked': False}, format='json')
+        self.assertCounters(2, 0)
+
+        batch_url = reverse('task-subtask-batch', args=[self.task.pk])
+        self.client.post(batch_url, [{'subtasktext': 'Third', 'checked': True}], format='json')
+        self.client.patch(batch_url, [{'id': first, 'checked': True}], format='json')
+        self.assertCounters(3, 2)
+
+        self.client.put(reverse('task-subtask-detail', args=[self.task.pk, first]),
+                        {'subtasktext': 'First', 'checked': False}, format='json')
+        self.assertCounters(3, 1)
+
+        self.client.delete(reverse('task-subtask-detail', args=[self.task.pk, first]))
+        self.assertCounters(2, 1)
+
+    def test_counter_changes_update_the_task(self):
+        Task.objects.filter(pk=self.task.pk).update(updated_at=now() - timedelta(days=1))
+        self.client.post(reverse('task-subtask-list', args=[self.task.pk]), {'subtasktext': 'First'}, format='json')
+        self.task.refresh_from_db()
+        self.assertGreater(self.task.updated_at, now() - timedelta(minutes=1))
+
+    def test_repair(self):
+        Subtask.objects.bulk_create([
+            Subtask(task=self.task, subtasktext='First', checked=True),
+            Subtask(task=self.task, subtasktext='Second'),
+        ])
+        self.assertEqual(repair_subtask_counters(), 1)
+        self.assertCounters(2, 1)
+        self.assertEqual(repair_subtask_counters(), 0)
+
+
+@override_settings(BOARD_EVENTS_HEARTBEAT=0.01, ACTIVITY_FLUSH_INTERVAL=0)
+class BoardEventsTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.token = ExpiringToken.objects.create(user=self.user)
+        token_cache.clear()
+
+    async def test_heartbeat(self):
+        request = AsyncRequestFactory().get('/api/auth/events/', {'token': self.token.key})
+        response = await board_events(request)
+        self.assertEqual(response.status_code, 200)
+
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        self.assertEqual(await anext(stream), b': heartbeat\n\n')
+        await stream.aclose()
+
+        await self.user.arefresh_from_db()
+        self.assertIsNotNone(self.user.last_activity)
+
+    async def test_invalid_token(self):
+        request = AsyncRequestFactory().get('/api/auth/events/', {'token': 'invalid'})
+        response = await board_events(request)
+        self.assertEqual(response.status_code, 401)
+
+
+
+class AsyncBoardViewTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        other = CustomUser.objects.create_user(username='other', email='other@example.com')
+        self.token = ExpiringToken.objects.create(user=self.user)
+        self.task = Task.objects.create(title='Task', date='2024-01-01', category='Work', status='todo',
+                                        created_by=self.user)
+        self.foreign_task = Task.objects.create(title='Foreign', date='2024-01-01', category='Work', status='todo',
+                                                created_by=other)
+        self.contact = Contact.objects.create(name='Max Mustermann', email='max@example.com', phone='+49 123456',
+                                              emblem='MM', color='#000000', user=self.user)
+        token_cache.clear()
+
+    async def request(self, view, data=None, method='get', token=None, headers=None, **kwargs):
+        headers = {'Authorization': f'Token {token or self.token.key}', **(headers or {})}
+        if method == 'get':
+            request = AsyncRequestFactory().get('/', data, headers=headers)
+        else:
+            request = getattr(AsyncRequestFactory(), method)('/', data, content_type='application/json',
+                                                             headers=headers)
+        response = await view.as_view()(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    async def test_lists(self):
+        views = [(AsyncTaskList, self.task.pk, 'cardId'), (AsyncContactList, self.contact.pk, 'id')]
+        for view, object_id, key in views:
+            response = await self.request(view)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([item[key] for item in json.loads(response.content)], [object_id])
+
+            response = await self.request(view, headers={'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, 304)
+
+    async def test_details(self):
+        response = await self.request(AsyncTaskDetail, cardId=self.task.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['title'], 'Task')
+        headers = {'If-None-Match': response['ETag']}
+        response = await self.request(AsyncTaskDetail, headers=headers, cardId=self.task.pk)
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.request(AsyncContactDetail, id=self.contact.pk)
+        self.assertEqual(json.loads(response.content)['name'], 'Max Mustermann')
+
+        self.assertEqual((await self.request(AsyncTaskDetail, cardId=self.foreign_task.pk)).status_code, 404)
+        self.assertEqual((await self.request(AsyncContactDetail, id=0)).status_code, 404)
+
+    async def test_invalid_token(self):
+        response = await self.request(AsyncTaskList, token='invalid')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+        response = await AsyncTaskList.as_view()(AsyncRequestFactory().get('/'))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_paginated_requests_use_sync_view(self):
+        response = await self.request(AsyncTaskList, {'page_size': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['cardId'] for task in response.data['results']], [self.task.pk])
+
+        response = await self.request(AsyncTaskList, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_writes_use_sync_view(self):
+        response = await self.request(AsyncContactDetail, {'name': 'Erika Mustermann'}, 'patch', id=self.contact.pk)
+        self.assertEqual(response.status_code, 200)
+        await self.contact.arefresh_from_db()
+        self.assertEqual(self.contact.name, 'Erika Mustermann')
+
+        response = await self.request(AsyncTaskDetail, method='delete', cardId=self.task.pk)
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(await Task.objects.filter(pk=self.task.pk).aexists())
+
+
+class TaskSearchTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+
+    def search(self, query):
+        response = self.client.get(reverse('task-search'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [task['cardId'] for task in response.data]
+
+    def test_created_and_edited_tasks_are_found(self):
+        self.assertTrue(search.has_search_index())
+        task_id = self.client.post(reverse('task-list'), {
+            'title': 'Quarterly report', 'description': 'Numbers', 'date': '2024-01-01', 'category': 'Work',
+            'status': 'todo', 'subtasks': [{'subtasktext': 'Collect invoices'}],
+        }, format='json').data['cardId']
+        self.assertEqual(self.search('quart'), [task_id])
+        self.assertEqual(self.search('invoices'), [task_id])
+
+        self.client.patch(reverse('task-detail', args=[task_id]), {'title': 'Annual summary'}, format='json')
+        self.assertEqual(self.search('quarterly'), [])
+        self.assertEqual(self.search('annual'), [task_id])
+
+        self.client.post(reverse('task-subtask-list', args=[task_id]), {'subtasktext': 'Print slides'}, format='json')
+        self.assertEqual(self.search('slides'), [task_id])
+
+    def test_missing_triggers_are_rebuilt(self):
+        if not search.supports_search_index(connection):
+            self.skipTest('SQLite without FTS5')
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER join_app_task_fts_insert")
+        self.assertEqual(search.get_missing_index_objects(connection), ['join_app_task_fts_insert'])
+        self.assertTrue(search.ensure_search_index(connection))
+        self.assertEqual(search.get_missing_index_objects(connection), [])
+        self.assertFalse(search.ensure_search_index(connection))
+
+
+class TaskStatusTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title='Task', date='2024-01-01', category='Work', status='todo',
+                                        created_by=self.user)
+        self.url = reverse('task-detail', args=[self.task.pk])
+
+    def test_update_status(self):
+        response = self.client.patch(self.url, {'status': 'done', 'version': 0}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['status'], response.data['version']), ('done', 1))
+        response = self.client.patch(self.url, {'status': 'todo'}, format='json')
+        self.assertEqual(response.data['version'], 2)
+
+    def test_update_status_conflict(self):
+        Task.objects.filter(pk=self.task.pk).update(version=3)
+        response = self.client.patch(self.url, {'status': 'done', 'version': 2}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['version'], 3)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).status, 'todo')
+
+    def test_update_status_not_found(self):
+        other = CustomUser.objects.create_user(username='other', email='other@example.com')
+        task = Task.objects.create(title='Foreign', date='2024-01-01', category='Work', status='todo', created_by=other)
+        response = self.client.patch(reverse('task-detail', args=[task.pk]), {'status': 'done'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.patch(reverse('task-detail', args=[task.pk]), {'status': 'done', 'version': 0},
+                                     format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_increments_current_version(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        Task.objects.filter(pk=self.task.pk).update(version=5)
+        serializer = TaskSerializer(stale, data={'title': 'Renamed'}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(serializer.data['version'], 6)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).version, 6)
+
+
+class BoardSyncTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_cursors(self):
+        url = reverse('board-sync')
+        cursor = self.client.get(url).data['cursor']
+        self.assertEqual(self.client.get(url, {'since': cursor}).status_code, 200)
+        naive = (now() - timedelta(minutes=1)).replace(tzinfo=None).isoformat()
+        self.assertEqual(self.client.get(url, {'since': naive}).status_code, 200)
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': '2026-13-01T00:00:00'}).status_code, 400)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+        Task.objects.bulk_create([
+            Task(title=f'Task {index}', date='2024-01-01', category='Work', status='todo', created_by=self.user)
+            for index in range(3)
+        ])
+
+    def test_pages(self):
+        response = self.client.get(reverse('task-list'), {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursors(self):
+        for data in [['cardId', 5], ['cardId', {'a': 1}], ['cardId', [{'a': 1}]], ['cardId', ['x']], ['date', [1]]]:
+            cursor = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+            response = self.client.get(reverse('task-list'), {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, data)
+        self.assertEqual(self.client.get(reverse('task-list'), {'cursor': 'invalid'}).status_code, 404)
+
+
+class BoardVersionTests(APITestCase):
+    def setUp(self):
+        self.owner = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.assignee = CustomUser.objects.create_user(username='anna', email='anna@example.com')
+        task = Task.objects.create(title='Task', date='2024-01-01', category='Work', status='todo', created_by=self.owner)
+        TaskUserDetails.objects.create(task=task, user=self.assignee)
+        self.client.force_authenticate(self.owner)
+
+    def get_tasks(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('task-list'), **headers)
+
+    def test_not_modified(self):
+        etag = self.get_tasks()['ETag']
+        self.assertEqual(self.get_tasks(etag).status_code, 304)
+        self.client.post(reverse('contact-list'), {
+            'name': 'Max Mustermann', 'email': 'max@example.com', 'phone': '+49 123456789', 'emblem': 'MM',
+            'color': '#000000',
+        }, format='json')
+        self.assertEqual(self.get_tasks(etag).status_code, 200)
+
+    def test_assignee_change_invalidates_board(self):
+        etag = self.get_tasks()['ETag']
+        self.assignee.username = 'anna-maria'
+        self.assignee.save()
+        response = self.get_tasks(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['user'][0]['user']['username'], 'anna-maria')
+
+    def test_login_keeps_board(self):
+        etag = self.get_tasks()['ETag']
+        self.assignee.last_login = now()
+        self.assignee.save(update_fields=['last_login'])
+        self.assertEqual(self.get_tasks(etag).status_code, 304)
+
+
+class NestedSubtaskTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, subtasks):
+        return self.client.post(reverse('task-list'), {
+            'title': 'Task', 'date': '2024-01-01', 'category': 'Work', 'status': 'todo', 'subtasks': subtasks,
+        }, format='json')
+
+    def test_subtask_limit(self):
+        subtasks = [{'subtasktext': f'Subtask {i}'} for i in range(MAX_SUBTASKS + 1)]
+        response = self.create_task(subtasks)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('subtasks', response.data)
+
+        task_id = self.create_task(subtasks[:MAX_SUBTASKS]).data['cardId']
+        url = reverse('task-detail', args=[task_id])
+        response = self.client.put(url, {
+            'title': 'Task', 'date': '2024-01-01', 'category': 'Work', 'status': 'todo', 'subtasks': subtasks,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.patch(url, {'subtasks': subtasks}, format='json').status_code, 400)
+        self.assertEqual(Subtask.objects.filter(task=task_id).count(), MAX_SUBTASKS)
+
+    def test_subtask_ids_stay_stable(self):
+        subtasks = [{'subtasktext': 'First'}, {'subtasktext': 'Second'}, {'subtasktext': 'Third'}]
+        task_id = self.create_task(subtasks).data['cardId']
+        ids = {subtask.subtasktext: subtask.id for subtask in Subtask.objects.filter(task=task_id)}
+
+        response = self.client.put(reverse('task-detail', args=[task_id]), {
+            'title': 'Task', 'date': '2024-01-01', 'category': 'Work', 'status': 'todo', 'subtasks': [
+                {'id': ids['First'], 'subtasktext': 'First renamed', 'checked': True},
+                {'subtasktext': 'Second'},
+                {'subtasktext': 'Fourth'},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        subtasks = {subtask.subtasktext: subtask for subtask in Subtask.objects.filter(task=task_id)}
+        self.assertEqual(set(subtasks), {'First renamed', 'Second', 'Fourth'})
+        self.assertEqual(subtasks['First renamed'].id, ids['First'])
+        self.assertTrue(subtasks['First renamed'].checked)
+        self.assertEqual(subtasks['Second'].id, ids['Second'])
+        self.assertEqual(
+            list(Tombstone.objects.filter(user=self.user, model=Tombstone.SUBTASK).values_list('object_id', flat=True)),
+            [ids['Third']]
+        )
+
+    def test_partial_update_keeps_relations(self):
+        assignee = CustomUser.objects.create_user(username='anna', email='anna@example.com')
+        task_id = self.create_task([{'subtasktext': 'First'}]).data['cardId']
+        url = reverse('task-detail', args=[task_id])
+        self.client.patch(url, {'user_ids': [assignee.pk]}, format='json')
+        subtask_ids = list(Subtask.objects.filter(task=task_id).values_list('id', flat=True))
+
+        response = self.client.patch(url, {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([subtask['id'] for subtask in response.data['subtasks']], subtask_ids)
+        self.assertEqual([details['user']['id'] for details in response.data['user']], [assignee.pk])
+        self.assertFalse(Tombstone.objects.exists())
+
+
+class TaskBulkMoveTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        other = CustomUser.objects.create_user(username='other', email='other@example.com')
+        self.client.force_authenticate(self.user)
+        self.tasks = Task.objects.bulk_create([
+            Task(title=f'Task {index}', date='2024-01-01', category='Work', status='todo', created_by=self.user)
+            for index in range(3)
+        ])
+        self.foreign_task = Task.objects.create(title='Foreign', date='2024-01-01', category='Work', status='todo',
+                                                created_by=other)
+        self.url = reverse('task-bulk-move')
+
+    def move(self, moves):
+        return self.client.post(self.url, moves, format='json')
+
+    def test_move(self):
+        response = self.move([
+            {'cardId': self.tasks[0].pk, 'status': 'done'},
+            {'cardId': self.tasks[1].pk, 'status': 'inProgress'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(response.data, {'updated': 2, 'version': self.user.board_version})
+        self.assertEqual(self.user.board_version, 1)
+
+        tasks = Task.objects.in_bulk([task.pk for task in self.tasks])
+        self.assertEqual([tasks[task.pk].status for task in self.tasks], ['done', 'inProgress', 'todo'])
+        self.assertEqual([tasks[task.pk].version for task in self.tasks], [1, 1, 0])
+
+    def test_invalid_ids(self):
+        response = self.move([
+            {'cardId': self.tasks[0].pk, 'status': 'done'},
+            {'cardId': self.foreign_task.pk, 'status': 'done'},
+            {'cardId': 0, 'status': 'done'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['cardIds'], [0, self.foreign_task.pk])
+        self.assertFalse(Task.objects.filter(status='done').exists())
+
+    def test_duplicate_ids(self):
+        response = self.move([
+            {'cardId': self.tasks[0].pk, 'status': 'done'},
+            {'cardId': self.tasks[0].pk, 'status': 'inProgress'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['cardIds'], [self.tasks[0].pk])
+        self.assertEqual(Task.objects.get(pk=self.tasks[0].pk).status, 'todo')
+
+    def test_empty_list(self):
+        response = self.move([])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': 0, 'version': 0})
+
+
+class TaskSummaryTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        other = CustomUser.objects.create_user(username='other', email='other@example.com')
+        self.client.force_authenticate(self.user)
+        today = localdate()
+        Task.objects.bulk_create([
+            Task(title='Past', date=today - timedelta(days=1), category='Work', status='todo', created_by=self.user),
+            Task(title='Done', date=today, category='Work', status='done', priority='urgent', created_by=self.user),
+            Task(title='Next', date=today + timedelta(days=3), category='Work', status='todo', priority='Urgent',
+                 created_by=self.user),
+            Task(title='Later', date=today + timedelta(days=5), category='Work', status='inProgress',
+                 created_by=self.user),
+            Task(title='Foreign', date=today, category='Work', status='todo', priority='urgent', created_by=other),
+        ])
+        cache.clear()
+
+    def get_summary(self):
+        response = self.client.get(reverse('task-summary'))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_summary(self):
+        self.assertEqual(self.get_summary(), {
+            'total': 4,
+            'status': {'todo': 2, 'done': 1, 'inProgress': 1},
+            'urgent': 2,
+            'upcoming_deadline': (localdate() + timedelta(days=3)).isoformat(),
+            'version': 0,
+        })
+
+    def test_task_write_invalidates_summary(self):
+        self.get_summary()
+        self.client.post(reverse('task-list'), {
+            'title': 'Today', 'date': localdate().isoformat(), 'category': 'Work', 'status': 'todo',
+        }, format='json')
+        summary = self.get_summary()
+        self.assertEqual(summary['total'], 5)
+        self.assertEqual(summary['status']['todo'], 3)
+        self.assertEqual(summary['upcoming_deadline'], localdate().isoformat())
+        self.assertEqual(summary['version'], 1)
+
+    def test_summary_is_cached_per_day(self):
+        self.get_summary()
+        with mock.patch('join_app.api.views.localdate', return_value=localdate() + timedelta(days=4)):
+            summary = self.get_summary()
+        self.assertEqual(summary['upcoming_deadline'], (localdate() + timedelta(days=5)).isoformat())
+
+
+class CompressionTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+
+    def create_contacts(self, count):
+        Contact.objects.bulk_create([
+            Contact(name=f'Contact {index}', email=f'contact{index}@example.com', phone='+49 123456', emblem='C',
+                    color='#000000', user=self.user)
+            for index in range(count)
+        ])
+
+    def get_contacts(self, accept_encoding='gzip'):
+        return self.client.get(reverse('contact-list'), HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    @mock.patch.dict(middleware.COMPRESSORS, {'br': object, 'zstd': object})
+    @override_settings(COMPRESSION_ENCODINGS=['zstd', 'br', 'gzip'])
+    def test_negotiate_encoding(self):
+        for accept_encoding, coding in [
+            ('', None),
+            ('identity', None),
+            ('gzip', 'gzip'),
+            ('GZIP;q=0.5', 'gzip'),
+            ('gzip;q=0', None),
+            ('gzip;q=invalid', None),
+            ('gzip, br', 'br'),
+            ('gzip, br, zstd', 'zstd'),
+            ('gzip;q=1.0, br;q=0.8', 'gzip'),
+            ('*', 'zstd'),
+            ('*;q=0.5, gzip', 'gzip'),
+            ('*, zstd;q=0', 'br'),
+            ('*;q=0', None),
+        ]:
+            self.assertEqual(middleware.negotiate_encoding(accept_encoding), coding, accept_encoding)
+
+    def test_compressed_response(self):
+        self.create_contacts(20)
+        plain = self.get_contacts('')
+        response = self.get_contacts()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('Authorization', response['Vary'])
+        self.assertEqual(response['ETag'], plain['ETag'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotIn('X-Compression', response)
+
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+    def test_min_size(self):
+        self.create_contacts(1)
+        with override_settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            response = self.get_contacts()
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('Accept-Encoding', response.get('Vary', ''))
+
+        with override_settings(COMPRESSION_MIN_SIZE=1):
+            self.assertEqual(self.get_contacts()['Content-Encoding'], 'gzip')
+
+    @override_settings(COMPRESSION_MIN_SIZE=1)
+    def test_url_allowlist(self):
+        response = self.client.get(reverse('task-summary'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response)
+
+    @override_settings(COMPRESSION_MIN_SIZE=1)
+    def test_strong_etag_is_weakened(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        request.resolver_match = resolve(reverse('contact-list'))
+        response = HttpResponse(b'{"name": "Max"}', content_type='application/json')
+        response['ETag'] = '"abc"'
+        response = middleware.CompressionMiddleware(lambda request: response)(request)
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertEqual(gzip.decompress(response.content), b'{"name": "Max"}')
+
+    def test_streaming_response(self):
+        self.create_contacts(settings.JSON_STREAMING_THRESHOLD)
+        plain = self.get_contacts('')
+        self.assertTrue(plain.streaming)
+        response = self.get_contacts()
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response)
+
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), b''.join(plain.streaming_content))
+
+    @override_settings(DEBUG=True)
+    def test_debug_header(self):
+        self.create_contacts(20)
+        response = self.get_contacts()
+        self.assertRegex(response['X-Compression'], rf'^gzip; {len(gzip.decompress(response.content))} -> '
+                                                    rf'{len(response.content)} bytes; saved \d+; cpu [\d.]+ ms$')
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
 from decouple import config
 from django.apps import AppConfig
@@ -45,13 +46,13 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'rest_framework.authtoken',
     'join_app',
     'user_auth_app',
     'corsheaders',
 ]
 
 MIDDLEWARE = [
+    'join_app.api.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -141,8 +142,116 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.api.authentication.CachedTokenAuthentication',
+    ],
+    # JSON is encoded and decoded with orjson if it is installed, otherwise with
+    # the standard library like DRF's JSONRenderer and JSONParser
+    'DEFAULT_RENDERER_CLASSES': [
+        'join_app.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'join_app.api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
-AUTH_USER_MODEL = 'user_auth_app.CustomUser'
\ No newline at end of file
+AUTH_USER_MODEL = 'user_auth_app.CustomUser'
+
+TEST_RUNNER = 'join_backend_django.test_runner.TestRunner'
+
+# Authenticated tokens are cached in memory for TOKEN_CACHE_TTL seconds.
+# Tokens expire after INACTIVITY_TIMEOUT_MINUTES without activity and are renewed
+# at most every TOKEN_RENEW_INTERVAL seconds.
+
+TOKEN_CACHE_MAX_SIZE = 1024
+
+TOKEN_CACHE_TTL = 60
+
+TOKEN_RENEW_INTERVAL = 10
+
+# Inactivity handling
+# Users without activity for INACTIVITY_TIMEOUT_MINUTES lose their token, guests are deleted.
+# The sweeper thread is only started in processes with INACTIVITY_SWEEPER enabled, so enable
+# it for exactly one worker (or schedule `manage.py sweep_inactive_users` externally instead).
+# It runs every INACTIVITY_SWEEP_INTERVAL seconds (0 disables the thread).
+
+INACTIVITY_TIMEOUT_MINUTES = 1
+
+INACTIVITY_SWEEPER = config('INACTIVITY_SWEEPER', default=False, cast=bool)
+
+INACTIVITY_SWEEP_INTERVAL = config('INACTIVITY_SWEEP_INTERVAL', default=30, cast=int)
+
+# Activity timestamps are collected in memory and written in one bulk update
+# at most every ACTIVITY_FLUSH_INTERVAL seconds.
+
+ACTIVITY_FLUSH_INTERVAL = config('ACTIVITY_FLUSH_INTERVAL', default=5, cast=int)
+
+# Guest logins claim a prepared account from the guest pool. The pool is refilled
+# to GUEST_POOL_SIZE accounts once it falls below GUEST_POOL_LOW_WATER.
+
+GUEST_POOL_SIZE = config('GUEST_POOL_SIZE', default=10, cast=int)
+
+GUEST_POOL_LOW_WATER = config('GUEST_POOL_LOW_WATER', default=3, cast=int)
+
+# Delta sync: deleted tasks, subtasks and contacts are remembered for
+# SYNC_TOMBSTONE_RETENTION_DAYS. Returned cursors overlap by SYNC_CURSOR_OVERLAP
+# seconds, so writes committed during a sync request are not missed.
+
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+SYNC_CURSOR_OVERLAP = 2
+
+# The task summary is cached per board version for TASK_SUMMARY_CACHE_TIMEOUT seconds.
+
+TASK_SUMMARY_CACHE_TIMEOUT = 300
+
+# Maximum number of tasks returned by the full-text search
+
+TASK_SEARCH_LIMIT = 50
+
+# Realtime board events (Server-Sent Events)
+# BOARD_EVENTS_BROKER: join_app.api.events.InProcessBroker for a single worker,
+# join_app.api.events.SpoolBroker to share events between the workers of one host.
+# The spool file is rotated to BOARD_EVENTS_SPOOL + '.1' once it exceeds
+# BOARD_EVENTS_SPOOL_MAX_SIZE bytes, so at most two files are kept.
+
+BOARD_EVENTS_BROKER = config('BOARD_EVENTS_BROKER', default='join_app.api.events.InProcessBroker')
+BOARD_EVENTS_SPOOL = config('BOARD_EVENTS_SPOOL', default=str(Path(tempfile.gettempdir()) / 'join_board_events.spool'))
+BOARD_EVENTS_SPOOL_MAX_SIZE = config('BOARD_EVENTS_SPOOL_MAX_SIZE', default=1024 * 1024, cast=int)
+BOARD_EVENTS_SPOOL_POLL_INTERVAL = 0.2
+BOARD_EVENTS_QUEUE_SIZE = 100
+BOARD_EVENTS_HEARTBEAT = 15
+BOARD_EVENTS_RETRY = 3000
+
+# Serve the hot read endpoints with async views (enable when running under ASGI)
+
+ASYNC_API_VIEWS = config('ASYNC_API_VIEWS', default=False, cast=bool)
+
+# Unpaginated lists with at least this many items are streamed in chunks
+
+JSON_STREAMING_THRESHOLD = 500
+
+# Response compression: codings in order of preference (br and zstd need the
+# brotli and zstandard packages), minimum body size and compressed endpoints
+
+COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_URL_NAMES = [
+    'task-list',
+    'task-search',
+    'task-subtask-list',
+    'contact-list',
+    'customeruser-list',
+    'board-sync',
+]
+
+# Completed tasks that were last changed more than TASK_ARCHIVE_AFTER_DAYS ago are
+# moved into the archive tables by the sweeper (0 disables it, e.g. when
+# `manage.py archive_done_tasks` is scheduled externally), TASK_ARCHIVE_BATCH_SIZE
+# tasks per transaction.
+
+TASK_ARCHIVE_AFTER_DAYS = config('TASK_ARCHIVE_AFTER_DAYS', default=30, cast=int)
+
+TASK_ARCHIVE_BATCH_SIZE = config('TASK_ARCHIVE_BATCH_SIZE', default=500, cast=int)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from user_auth_app.api.sweeper import stop_sweeper
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that disables the background sweeper for the whole test run, so
+    no thread purges guests, archives tasks or prunes tombstones while tests run.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        """
+        Sets up the test environment with the sweeper disabled. A sweeper that
+        was already started for ``INACTIVITY_SWEEPER`` is stopped.
+        """
+        super().setup_test_environment(**kwargs)
+        settings.INACTIVITY_SWEEPER = False
+        settings.INACTIVITY_SWEEP_INTERVAL = 0
+        stop_sweeper()
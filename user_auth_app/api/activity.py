@@ -0,0 +1,97 @@
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils.timezone import now
+
+FLUSH_BATCH_SIZE = 400
+
+
+class ActivityTracker:
+    def __init__(self):
+        """
+        Initialize the tracker with an empty set of pending activity timestamps.
+
+        Timestamps are kept per user id, so repeated activity of the same user
+        between two flushes results in a single row update.
+        """
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def touch(self, user, timestamp=None):
+        """
+        Records activity of the given user.
+
+        The timestamp is only kept in memory. If ``ACTIVITY_FLUSH_INTERVAL``
+        seconds have passed since the last flush, all pending timestamps are
+        written to the database.
+
+        :param user: The user that was active
+        :type user: CustomUser
+        :param timestamp: The time of the activity, defaults to now
+        :type timestamp: datetime.datetime
+        """
+        if self._record(user, timestamp):
+            self.flush()
+
+    async def atouch(self, user, timestamp=None):
+        """
+        Async version of ``touch()``. Only a due flush leaves the event loop.
+        """
+        if self._record(user, timestamp):
+            await sync_to_async(self.flush)()
+
+    def _record(self, user, timestamp):
+        """
+        Stores the timestamp of the user.
+
+        :return: True if the pending timestamps should be flushed
+        :rtype: bool
+        """
+        timestamp = timestamp or now()
+        with self._lock:
+            self._pending[user.pk] = timestamp
+            return time.monotonic() - self._last_flush >= settings.ACTIVITY_FLUSH_INTERVAL
+
+    def flush(self):
+        """
+        Writes all pending timestamps to the database.
+
+        All users are updated with one ``UPDATE ... CASE`` statement per batch of
+        ``FLUSH_BATCH_SIZE`` users. If the update fails, the timestamps are put
+        back so that they are written with the next flush.
+
+        :return: The number of updated users
+        :rtype: int
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        items = list(pending.items())
+        updated = 0
+        try:
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                batch = items[start:start + FLUSH_BATCH_SIZE]
+                updated += get_user_model().objects.filter(
+                    pk__in=[user_id for user_id, _ in batch]
+                ).update(last_activity=Case(
+                    *[When(pk=user_id, then=Value(timestamp)) for user_id, timestamp in batch],
+                    output_field=DateTimeField()
+                ))
+        except Exception:
+            with self._lock:
+                for user_id, timestamp in items:
+                    self._pending.setdefault(user_id, timestamp)
+            raise
+
+        return updated
+
+
+activity_tracker = ActivityTracker()
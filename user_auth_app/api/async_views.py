@@ -0,0 +1,95 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+from .authentication import CachedTokenAuthentication
+from .serializers import CustomUserSerializer
+from .views import CurrentUser, ValidateTokenView
+
+
+class AsyncAPIView(View):
+    """
+    Async variant of a DRF view for the read requests of a hot endpoint.
+
+    GET requests are authenticated with the token cache and answered by the async
+    ``get()`` of the subclass, so a worker serves them without leaving the event
+    loop. All other requests, and GET requests for which ``use_sync_view()``
+    returns True, are passed on to the DRF view in ``sync_view``.
+    """
+    sync_view = None
+    sync_handler = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """
+        Returns the async view function. Like DRF views it is exempt from CSRF
+        checks, since the API is authenticated with tokens.
+        """
+        view = super().as_view(sync_handler=sync_to_async(cls.sync_view.as_view()), **initkwargs)
+        return csrf_exempt(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Authenticates a GET request and calls ``get()``, or passes the request on
+        to the sync view.
+
+        Returns a 401 Unauthorized response if the token is missing or invalid.
+        """
+        if request.method != 'GET' or self.use_sync_view(request):
+            return await self.sync_handler(request, *args, **kwargs)
+
+        try:
+            credentials = await CachedTokenAuthentication().aauthenticate(request)
+        except exceptions.AuthenticationFailed as e:
+            return self.unauthorized(e.detail)
+        if credentials is None:
+            return self.unauthorized(exceptions.NotAuthenticated.default_detail)
+
+        request.user, request.auth = credentials
+        return await self.get(request, *args, **kwargs)
+
+    def use_sync_view(self, request):
+        """
+        Returns True if the GET request should be served by the sync view.
+        """
+        return False
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        """
+        Returns a JSON response rendered with the default renderer of the DRF views.
+        """
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return HttpResponse(renderer.render(data), content_type=renderer.media_type, status=status_code)
+
+    def unauthorized(self, detail):
+        """
+        Returns a 401 Unauthorized response like DRF's token authentication.
+        """
+        response = self.render({'detail': detail}, status.HTTP_401_UNAUTHORIZED)
+        response['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+        return response
+
+
+class AsyncCurrentUser(AsyncAPIView):
+    sync_view = CurrentUser
+
+    async def get(self, request):
+        """
+        Returns the user of the current request. With a cached token no query is
+        needed.
+        """
+        return self.render(CustomUserSerializer(request.user).data)
+
+
+class AsyncValidateToken(AsyncAPIView):
+    sync_view = ValidateTokenView
+
+    async def get(self, request):
+        """
+        Validiert das Token direkt.
+
+        Abgelaufene Token werden bereits bei der Authentifizierung mit 401 abgelehnt.
+        """
+        return self.render({"message": "Token is valid"})
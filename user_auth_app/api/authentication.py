@@ -0,0 +1,202 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from user_auth_app.models import CustomUser, ExpiringToken
+
+
+class TokenCache:
+    def __init__(self):
+        """
+        Initialize an empty LRU cache that maps token keys to ``(user, token)``
+        pairs together with the time at which each entry expires.
+        """
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns the cached ``(user, token)`` pair for the given token key.
+
+        Expired entries are removed and reported as a miss.
+
+        :param key: The token key
+        :type key: str
+        :return: The cached pair or None
+        :rtype: tuple
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, user, token):
+        """
+        Caches the ``(user, token)`` pair for ``TOKEN_CACHE_TTL`` seconds and evicts
+        the least recently used entries beyond ``TOKEN_CACHE_MAX_SIZE``.
+        """
+        with self._lock:
+            self._entries[key] = ((user, token), time.monotonic() + settings.TOKEN_CACHE_TTL)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.TOKEN_CACHE_MAX_SIZE:
+                self._entries.popitem(last=False)
+
+    def evict(self, key):
+        """
+        Removes the entry of the given token key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_user(self, user_id):
+        """
+        Removes all entries that belong to the user with the given id.
+        """
+        with self._lock:
+            for key in [key for key, ((user, _), _) in self._entries.items() if user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the current number of entries.
+
+        :rtype: dict
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+token_cache = TokenCache()
+
+
+def revoke_tokens(user):
+    """
+    Deletes all tokens of the given user and removes them from the token cache.
+    """
+    ExpiringToken.objects.filter(user=user).delete()
+    token_cache.evict_user(user.pk)
+
+
+def get_unexpired_entry(key):
+    """
+    Returns the cached ``(user, token)`` pair for the given token key, or None if
+    it is not cached or its copy of the token has expired. Expired copies are
+    evicted, because the token may have been renewed by another worker.
+
+    :rtype: tuple
+    """
+    cached = token_cache.get(key)
+    if cached is not None and cached[1].is_expired():
+        token_cache.evict(key)
+        return None
+    return cached
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    model = ExpiringToken
+
+    def authenticate_credentials(self, key):
+        """
+        Authenticates the token key, looking it up in the token cache first.
+
+        On a cache miss the token and its user are loaded with the default
+        ``TokenAuthentication`` query and cached. A cached token that looks
+        expired is reloaded before it is rejected, since another worker may have
+        renewed it in the meantime. Valid tokens are renewed (sliding expiry). Every request
+        gets its own copy of the cached user, so changes to ``request.user`` do not
+        leak into other requests.
+
+        :raises: AuthenticationFailed if the token is invalid or expired or the user is inactive
+        """
+        cached = get_unexpired_entry(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token)
+        else:
+            user, token = cached
+
+        if token.is_expired():
+            token_cache.evict(key)
+            raise exceptions.AuthenticationFailed('Token expired.')
+
+        token.renew()
+        return (copy.copy(user), token)
+
+    async def aauthenticate(self, request):
+        """
+        Async version of ``authenticate()`` for async views.
+
+        :return: The user and the token or None if the request has no token
+        :rtype: tuple
+        :raises: AuthenticationFailed if the header or the token is invalid
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain invalid characters.'))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        """
+        Async version of ``authenticate_credentials()``.
+
+        A cache hit is answered without leaving the event loop, on a miss the token
+        is loaded with the async ORM.
+
+        :raises: AuthenticationFailed if the token is invalid or expired or the user is inactive
+        """
+        cached = get_unexpired_entry(key)
+        if cached is None:
+            try:
+                token = await self.model.objects.select_related('user').aget(key=key)
+            except self.model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            user = token.user
+            token_cache.set(key, user, token)
+        else:
+            user, token = cached
+
+        if token.is_expired():
+            token_cache.evict(key)
+            raise exceptions.AuthenticationFailed('Token expired.')
+
+        await token.arenew()
+        return (copy.copy(user), token)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def evict_changed_user(sender, instance, **kwargs):
+    """
+    Removes the cached tokens of a user that was changed or deleted, so that
+    authentication never returns stale user data.
+    """
+    token_cache.evict_user(instance.pk)
@@ -0,0 +1,203 @@
+import threading
+import uuid
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.db.models import Q, Subquery
+from django.utils.timezone import now
+from join_app.api.board import bump_board_version, delete_rows
+from join_app.api.events import publish_event
+from join_app.models import (
+    ArchivedSubtask, ArchivedTask, ArchivedTaskUserDetails, Contact, Subtask, Task, TaskUserDetails
+)
+from user_auth_app.models import CustomUser, ExpiringToken
+from .activity import activity_tracker
+from .authentication import revoke_tokens
+
+def build_guest():
+    """
+    Returns a new, unsaved guest user with a random username and email address.
+
+    :rtype: CustomUser
+    """
+    guest_username = f"guest_{uuid.uuid4().hex[:8]}"
+    return CustomUser(
+        username=guest_username,
+        email=f"{guest_username}@guest.com",
+        phone="123456789",
+        password=make_password(None),
+        is_guest=True,
+        emblem="G",
+        color="#cccccc"
+    )
+
+
+def get_pool_size():
+    """
+    Returns the number of guest accounts that are ready to be claimed.
+
+    Pooled guests are recognised by their token, which has not been issued yet
+    and therefore has no expiry time.
+
+    :rtype: int
+    """
+    return ExpiringToken.objects.filter(expires_at__isnull=True).count()
+
+
+_refill_lock = threading.Lock()
+
+
+def refill_guest_pool():
+    """
+    Tops up the guest pool to ``GUEST_POOL_SIZE`` accounts if it has fallen below
+    ``GUEST_POOL_LOW_WATER``.
+
+    The sweeper and the background refill of ``schedule_refill()`` share one lock,
+    so the pool is never topped up twice from the same stale pool size. If a
+    refill is already running, nothing is done.
+
+    :return: The number of created guest accounts
+    :rtype: int
+    """
+    if not _refill_lock.acquire(blocking=False):
+        return 0
+    try:
+        return _fill_guest_pool()
+    finally:
+        _refill_lock.release()
+
+
+def _fill_guest_pool():
+    """
+    Creates the missing guest accounts and their tokens with one bulk insert each.
+    The caller must hold the refill lock.
+
+    :return: The number of created guest accounts
+    :rtype: int
+    """
+    pool_size = get_pool_size()
+    if pool_size >= settings.GUEST_POOL_LOW_WATER:
+        return 0
+
+    with transaction.atomic():
+        guests = CustomUser.objects.bulk_create([
+            build_guest() for _ in range(settings.GUEST_POOL_SIZE - pool_size)
+        ])
+        ExpiringToken.objects.bulk_create([
+            ExpiringToken(key=ExpiringToken.generate_key(), user=guest, expires_at=None) for guest in guests
+        ])
+    return len(guests)
+
+
+def _refill_in_background():
+    """
+    Refills the guest pool and releases the refill lock afterwards.
+    """
+    try:
+        _fill_guest_pool()
+    except Exception as e:
+        print(f"[GuestPool] Error while refilling the guest pool: {e}")
+    finally:
+        connections.close_all()
+        _refill_lock.release()
+
+
+def schedule_refill():
+    """
+    Refills the guest pool in a background thread, unless a refill is already running.
+    """
+    if _refill_lock.acquire(blocking=False):
+        threading.Thread(target=_refill_in_background, name='guest-pool-refill', daemon=True).start()
+
+
+def claim_guest():
+    """
+    Claims a guest account from the pool and issues its token.
+
+    The claim is a single UPDATE that gives the first pooled token a fresh key
+    and an expiry time, so concurrent claims can never hand out the same guest.
+    If the pool is empty, a guest is created on demand. A refill is scheduled
+    whenever the pool runs low.
+
+    :return: The issued token with its guest user
+    :rtype: ExpiringToken
+    """
+    key = ExpiringToken.generate_key()
+    claimed = ExpiringToken.objects.filter(
+        key=Subquery(ExpiringToken.objects.filter(expires_at__isnull=True).values('key')[:1])
+    ).update(key=key, expires_at=now() + ExpiringToken.get_lifetime())
+
+    if claimed:
+        token = ExpiringToken.objects.select_related('user').get(key=key)
+    else:
+        with transaction.atomic():
+            guest = build_guest()
+            guest.save()
+            token = ExpiringToken.objects.create(key=key, user=guest)
+
+    activity_tracker.touch(token.user)
+    if get_pool_size() < settings.GUEST_POOL_LOW_WATER:
+        schedule_refill()
+    return token
+
+
+def retire_guest(user):
+    """
+    Logs a guest out by revoking its token.
+
+    The sweeper deletes guests without a valid token, so the cascade delete of the
+    account and its data does not run on the request path.
+    """
+    revoke_tokens(user)
+
+
+
+def purge_guests(guests):
+    """
+    Deletes the given guest users together with their tasks, subtasks, task
+    assignments, archived tasks and contacts.
+
+    Django's cascade collector loads every related row into memory before
+    deleting it. The guest-owned board data is therefore removed first with one
+    plain DELETE statement per table, so the collector only has to handle the
+    guest rows themselves.
+
+    Guests can be assigned to tasks of regular users. These tasks lose the
+    assignment, so they are marked as changed and their owners get a new board
+    version and a task event.
+
+    :param guests: The guest users to delete
+    :type guests: django.db.models.QuerySet
+    :return: The number of deleted guest users
+    :rtype: int
+    """
+    guest_ids = list(guests.values_list('pk', flat=True))
+    if not guest_ids:
+        return 0
+
+    with transaction.atomic():
+        owners = {}
+        assigned_tasks = Task.objects.filter(user_statuses__user__in=guest_ids).exclude(created_by__in=guest_ids)
+        for card_id, owner_id in assigned_tasks.values_list('cardId', 'created_by_id').distinct():
+            owners.setdefault(owner_id, []).append(card_id)
+
+        task_ids = Task.objects.filter(created_by__in=guest_ids).values('pk')
+        archived_task_ids = ArchivedTask.objects.filter(created_by__in=guest_ids).values('pk')
+        for queryset in (
+            Subtask.objects.filter(task__in=task_ids),
+            TaskUserDetails.objects.filter(Q(task__in=task_ids) | Q(user__in=guest_ids)),
+            Task.objects.filter(created_by__in=guest_ids),
+            ArchivedSubtask.objects.filter(task__in=archived_task_ids),
+            ArchivedTaskUserDetails.objects.filter(Q(task__in=archived_task_ids) | Q(user__in=guest_ids)),
+            ArchivedTask.objects.filter(created_by__in=guest_ids),
+            Contact.objects.filter(user__in=guest_ids),
+        ):
+            delete_rows(queryset)
+
+        for owner_id, card_ids in owners.items():
+            Task.objects.filter(cardId__in=card_ids).update(updated_at=now())
+            bump_board_version(owner_id)
+            publish_event(owner_id, 'task', 'saved', card_ids)
+
+        _, deleted = CustomUser.objects.filter(pk__in=guest_ids).delete()
+    return deleted.get(CustomUser._meta.label, 0)
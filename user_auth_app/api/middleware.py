@@ -1,64 +1,53 @@
-from django.utils.timezone import now
-from datetime import timedelta
-from user_auth_app.models import CustomUser
-from rest_framework.authtoken.models import Token
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+from .activity import activity_tracker
 
 class UpdateLastActivityMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         """
         Initialize the middleware with a callable ``get_response`` which is used to
-        get the response for the current request.
+        get the response for the current request. The middleware runs sync or
+        async, depending on ``get_response``.
         """
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
         """
-        Updates the last activity timestamp of the user and removes inactive guest users
-        and the associated tokens of inactive users.
+        Records the activity of the user in the activity tracker, which writes
+        the timestamps of all active users to the database in one bulk update.
+
+        Cleanup of inactive users is done by the background sweeper, so the work
+        per request does not depend on the number of users.
         """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         response = self.get_response(request)
-        current_time = now()
-        
+
         if request.user.is_authenticated:
-            if request.user.last_activity:
-                inactivity_duration = (current_time - request.user.last_activity).total_seconds() / 60
-                if inactivity_duration > 0.1:
-                    request.user.last_activity = current_time
-                    request.user.save(update_fields=['last_activity'])
-            else:
-                request.user.last_activity = current_time
-                request.user.save(update_fields=['last_activity'])
-        
-        grace_period_time = now() - timedelta(minutes=1)
-        guest_threshold_time = now() - timedelta(minutes=1)
-        
-        inactive_guests = CustomUser.objects.filter(
-            is_guest=True,
-            last_activity__lt=guest_threshold_time,
-            date_joined__lt=grace_period_time
-        )
-        
-        if inactive_guests.exists():
-            print(f"[Middleware] Lösche {inactive_guests.count()} inaktive Gäste...")
-            for guest in inactive_guests:
-                try:
-                    print(f"[Middleware] Lösche Gast-Benutzer: {guest.email}")
-                    guest.delete()
-                except Exception as e:
-                    print(f"[Middleware] Fehler beim Löschen von Gast-Benutzer {guest.email}: {e}")
-            print("[Middleware] Inaktive Gäste erfolgreich gelöscht.")
-        
-        user_threshold_time = now() - timedelta(minutes=1)
-        inactive_users = CustomUser.objects.filter(
-            is_guest=False,
-            last_activity__lt=user_threshold_time
-        )
-        
-        for user in inactive_users:
-            token = Token.objects.filter(user=user).first()
-            if token:
-                print(f"[Middleware] Lösche Token für inaktiven Benutzer: {user.email}")
-                token.delete()
-                print(f"[Middleware] Token erfolgreich gelöscht für Benutzer: {user.email}")
-        
-        return response
\ No newline at end of file
+            activity_tracker.touch(request.user)
+
+        return response
+
+    async def __acall__(self, request):
+        """
+        Async version of ``__call__()``.
+
+        Token authenticated views replace ``request.user``. Only if it is still the
+        lazy session user, it is loaded with ``request.auser()`` so that no query
+        runs in the event loop.
+        """
+        response = await self.get_response(request)
+
+        user = request.user
+        if isinstance(user, SimpleLazyObject):
+            user = await request.auser()
+        if user.is_authenticated:
+            await activity_tracker.atouch(user)
+
+        return response
@@ -119,4 +119,29 @@ class EmailAuthTokenSerializer(serializers.Serializer):
             raise AuthenticationFailed("This account is inactive.")
 
         attrs['user'] = user
-        return attrs
\ No newline at end of file
+        return attrs
+
+class UserIdListField(serializers.ListField):
+    """
+    A list of user ids that is validated with a single query.
+
+    Duplicate ids are removed while keeping the order. All ids that do not belong
+    to an existing user are reported together in one validation error.
+    """
+    child = serializers.IntegerField()
+
+    def to_internal_value(self, data):
+        """
+        Returns the list of unique user ids.
+
+        Raises:
+            serializers.ValidationError: If any user ID does not exist.
+        """
+        user_ids = list(dict.fromkeys(super().to_internal_value(data)))
+        existing_ids = set(CustomUser.objects.filter(id__in=user_ids).values_list('id', flat=True))
+        invalid_ids = [user_id for user_id in user_ids if user_id not in existing_ids]
+        if invalid_ids:
+            raise serializers.ValidationError(
+                f"Invalid user IDs: {', '.join(str(user_id) for user_id in invalid_ids)}"
+            )
+        return user_ids
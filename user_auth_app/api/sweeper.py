@@ -0,0 +1,110 @@
+import threading
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils.timezone import now
+from join_app.api.archive import archive_done_tasks
+from join_app.api.board import prune_tombstones
+from user_auth_app.models import CustomUser, ExpiringToken
+from .activity import activity_tracker
+from .guests import purge_guests, refill_guest_pool
+
+
+def sweep_inactive_users():
+    """
+    Deletes inactive guest users and expired tokens.
+
+    Pending activity timestamps are flushed first. A guest counts as inactive once
+    its token has expired or was deleted on logout, pooled guests have a token that
+    has not been issued yet and are kept. Guests and their board data are deleted
+    with set-based queries, expired tokens are removed with a single range DELETE
+    on the indexed ``expires_at`` column.
+
+    :return: The number of deleted guest users and the number of deleted tokens
+    :rtype: tuple
+    """
+    activity_tracker.flush()
+    current_time = now()
+
+    deleted_guests = purge_guests(CustomUser.objects.filter(is_guest=True).filter(
+        Q(auth_token__isnull=True) | Q(auth_token__expires_at__lt=current_time)
+    ))
+
+    deleted_tokens, _ = ExpiringToken.objects.filter(expires_at__lt=current_time).delete()
+
+    return deleted_guests, deleted_tokens
+
+
+class InactivitySweeper(threading.Thread):
+    def __init__(self, interval):
+        """
+        Initialize the sweeper thread with the number of seconds to wait
+        between two sweeps.
+        """
+        super().__init__(name='inactivity-sweeper', daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        """
+        Runs a sweep, refills the guest pool, prunes old tombstones and archives
+        completed tasks every ``interval`` seconds until the thread is stopped.
+
+        Errors are reported and the next sweep is attempted as scheduled.
+        """
+        while not self._stopped.wait(self.interval):
+            try:
+                guests, tokens = sweep_inactive_users()
+                if guests or tokens:
+                    print(f"[Sweeper] Deleted {guests} inactive guests and {tokens} expired tokens.")
+                refill_guest_pool()
+                prune_tombstones()
+                if settings.TASK_ARCHIVE_AFTER_DAYS > 0:
+                    archived = archive_done_tasks()
+                    if archived:
+                        print(f"[Sweeper] Archived {archived} completed tasks.")
+            except Exception as e:
+                print(f"[Sweeper] Error while sweeping inactive users: {e}")
+            finally:
+                connections.close_all()
+
+    def stop(self):
+        """
+        Stops the thread after the current sweep.
+        """
+        self._stopped.set()
+
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+def start_sweeper():
+    """
+    Starts the in-process sweeper thread once per process.
+
+    The thread is not started if ``INACTIVITY_SWEEP_INTERVAL`` is 0, e.g. when the
+    ``sweep_inactive_users`` management command is scheduled externally instead.
+
+    :return: The running sweeper thread or None if it is disabled
+    :rtype: InactivitySweeper
+    """
+    global _sweeper
+    interval = settings.INACTIVITY_SWEEP_INTERVAL
+    if interval <= 0:
+        return None
+
+    with _sweeper_lock:
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper = InactivitySweeper(interval)
+            _sweeper.start()
+    return _sweeper
+
+
+def stop_sweeper():
+    """
+    Stops the in-process sweeper thread after its current sweep, if it runs.
+    """
+    with _sweeper_lock:
+        if _sweeper is not None:
+            _sweeper.stop()
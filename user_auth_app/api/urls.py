@@ -1,10 +1,26 @@
+from django.conf import settings
 from django.urls import path
-from join_app.api.views import ContactList, ContactDetail, TaskList, TaskDetail, SubtaskList, SubtaskDetail
+from join_app.api.views import ContactList, ContactDetail, TaskList, TaskDetail, TaskBulkMove, TaskSummary, TaskSearch, ArchivedTaskList, SubtaskList, SubtaskBatch, SubtaskDetail, BoardSync, board_events
 from .views import CustomerUserList, CustomerUserDetail, CurrentUser, LogoutView, RegisterView, EmailLoginView, GuestLoginView, GuestLogoutView, ActivityPingView, ValidateTokenView
 
+from join_app.api.async_views import AsyncTaskList, AsyncTaskDetail, AsyncContactList, AsyncContactDetail
+from .async_views import AsyncCurrentUser, AsyncValidateToken
+
+# Async-Varianten der häufigsten Lese-Endpunkte (für den Betrieb unter ASGI)
+if settings.ASYNC_API_VIEWS:
+    current_user_view = AsyncCurrentUser
+    validate_token_view = AsyncValidateToken
+    task_list_view, task_detail_view = AsyncTaskList, AsyncTaskDetail
+    contact_list_view, contact_detail_view = AsyncContactList, AsyncContactDetail
+else:
+    current_user_view = CurrentUser
+    validate_token_view = ValidateTokenView
+    task_list_view, task_detail_view = TaskList, TaskDetail
+    contact_list_view, contact_detail_view = ContactList, ContactDetail
+
 urlpatterns = [
     # Benutzerverwaltung
-    path('user/', CurrentUser.as_view(), name='currentuser'),
+    path('user/', current_user_view.as_view(), name='currentuser'),
     path('users/', CustomerUserList.as_view(), name='customeruser-list'),
     path('users/<int:pk>/', CustomerUserDetail.as_view(), name='customeruser-detail'),
 
@@ -17,17 +33,28 @@ urlpatterns = [
 
     # Pings
     path('ping-activity/', ActivityPingView.as_view(), name='ping-activity'),
-    path('validate-token/', ValidateTokenView.as_view(), name='validate-token'),
+    path('validate-token/', validate_token_view.as_view(), name='validate-token'),
 
     # Tasks (keine Benutzer-ID notwendig)
-    path('tasks/', TaskList.as_view(), name='task-list'),
-    path('tasks/<int:cardId>/', TaskDetail.as_view(), name='task-detail'),
+    path('tasks/', task_list_view.as_view(), name='task-list'),
+    path('tasks/move/', TaskBulkMove.as_view(), name='task-bulk-move'),
+    path('tasks/summary/', TaskSummary.as_view(), name='task-summary'),
+    path('tasks/search/', TaskSearch.as_view(), name='task-search'),
+    path('tasks/archived/', ArchivedTaskList.as_view(), name='task-archived-list'),
+    path('tasks/<int:cardId>/', task_detail_view.as_view(), name='task-detail'),
 
     # Subtasks (Task-ID notwendig)
     path('tasks/<int:cardId>/subtasks/', SubtaskList.as_view(), name='task-subtask-list'),
+    path('tasks/<int:cardId>/subtasks/batch/', SubtaskBatch.as_view(), name='task-subtask-batch'),
     path('tasks/<int:cardId>/subtasks/<int:id>/', SubtaskDetail.as_view(), name='task-subtask-detail'),
 
+    # Delta-Sync (Änderungen seit einem Cursor)
+    path('sync/', BoardSync.as_view(), name='board-sync'),
+
+    # Echtzeit-Updates (Server-Sent Events)
+    path('events/', board_events, name='board-events'),
+
     # Kontakte (keine Benutzer-ID notwendig)
-    path('contacts/', ContactList.as_view(), name='contact-list'),
-    path('contacts/<int:id>/', ContactDetail.as_view(), name='contact-detail'),
+    path('contacts/', contact_list_view.as_view(), name='contact-list'),
+    path('contacts/<int:id>/', contact_detail_view.as_view(), name='contact-detail'),
 ]
\ No newline at end of file
@@ -1,21 +1,25 @@
 from rest_framework import generics
+from join_app.api.fast_serializers import CompiledListMixin, user_serializer
+from join_app.api.pagination import KeysetPagination
 from .serializers import CustomUserSerializer, UserRegisterSerializer
-from ..models import CustomUser
+from ..models import CustomUser, ExpiringToken
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from .serializers import EmailAuthTokenSerializer
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
-import uuid
-from django.utils.timezone import now
-from datetime import timedelta
+from .activity import activity_tracker
+from .authentication import revoke_tokens
+from .guests import claim_guest, retire_guest
 
-class CustomerUserList(generics.ListCreateAPIView):
+class CustomerUserList(CompiledListMixin, generics.ListCreateAPIView):
     queryset = CustomUser.objects.filter(is_guest=False)
     serializer_class = CustomUserSerializer
+    compiled_serializer = user_serializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_orderings = {'id': ('id',)}
 
 class CustomerUserDetail(generics.RetrieveUpdateDestroyAPIView):
     queryset = CustomUser.objects.all()
@@ -95,11 +99,10 @@ class EmailLoginView(APIView):
             if not user.is_active:
                 return Response({"detail": "User account is inactive."}, status=status.HTTP_403_FORBIDDEN)
 
-            user.last_activity = now()
-            user.save(update_fields=['last_activity'])
+            activity_tracker.touch(user)
 
-            Token.objects.filter(user=user).delete()
-            token = Token.objects.create(user=user)
+            revoke_tokens(user)
+            token = ExpiringToken.objects.create(user=user)
 
             data = {
                 'token': token.key,
@@ -116,40 +119,19 @@ class GuestLoginView(APIView):
 
     def post(self, request):
         """
-        Creates a new guest user, deletes inactive guest users, and returns a JSON
-        response with the guest user's information and a JSON Web Token (JWT) that
-        can be used to access protected resources.
+        Claims a guest user from the guest pool and returns a JSON response with
+        the guest user's information and a token that can be used to access
+        protected resources.
+
+        Inactive guest users are deleted and the pool is refilled in the background.
 
         :param request: The request object
         :type request: rest_framework.request.Request
         :return: A response object
         :rtype: rest_framework.response.Response
         """
-        guest_threshold_time = now() - timedelta(minutes=1)
-        inactive_guests = CustomUser.objects.filter(
-            is_guest=True,
-            last_activity__lt=guest_threshold_time
-        )
-        if inactive_guests.exists():
-            inactive_guests.delete()
-            print("[GuestLoginView] Inactive guests deleted.")
-
-        guest_username = f"guest_{uuid.uuid4().hex[:3]}"
-        guest_email = f"{guest_username}@guest.com"
-
-        guest_user = CustomUser.objects.create_user(
-            username=guest_username,
-            email=guest_email,
-            phone="123456789",
-            password=None,
-            is_guest=True,
-            emblem="G",
-            color="#cccccc"
-        )
-        guest_user.last_activity = now()
-        guest_user.save()
-
-        token, _ = Token.objects.get_or_create(user=guest_user)
+        token = claim_guest()
+        guest_user = token.user
 
         return Response({
             "token": token.key,
@@ -173,11 +155,7 @@ class LogoutView(APIView):
         :return: A response object
         :rtype: rest_framework.response.Response
         """
-        user = request.user
-        try:
-            request.user.auth_token.delete()
-        except Exception:
-            pass  
+        revoke_tokens(request.user)
 
         return Response(
             {"message": "User successfully logged out."},
@@ -190,7 +168,9 @@ class GuestLogoutView(APIView):
 
     def post(self, request):
         """
-        Logs the guest user out by deleting the associated user and token.
+        Logs the guest user out by deleting the associated token.
+
+        The guest user and its data are deleted by the background sweeper.
 
         :param request: The request object
         :type request: rest_framework.request.Request
@@ -200,7 +180,7 @@ class GuestLogoutView(APIView):
         user = request.user
 
         if hasattr(user, 'is_guest') and user.is_guest:
-            user.delete()
+            retire_guest(user)
             return Response({"message": "GuestUser and Dates successfully deleted."}, status=status.HTTP_200_OK)
         else:
             return Response({"error": "No GuestUser found or authentication failed."}, status=status.HTTP_400_BAD_REQUEST)
@@ -210,7 +190,10 @@ class ActivityPingView(APIView):
 
     def post(self, request):
         """
-        Updates the last activity timestamp of the user associated with the current request.
+        Records activity of the user associated with the current request.
+
+        The timestamp is written to the database with the next bulk flush of the
+        activity tracker.
         
         Returns a 200 OK response if the user is successfully updated, or a 400 Bad Request response if
         the user is not authenticated or if the data is invalid.
@@ -221,9 +204,7 @@ class ActivityPingView(APIView):
         :rtype: rest_framework.response.Response
         """
         user = request.user
-        current_time = now()
-        user.last_activity = current_time
-        user.save(update_fields=['last_activity'])
+        activity_tracker.touch(user)
         
         if user.is_guest:
             return Response({'message': 'Guest activity updated'}, status=200)
@@ -235,14 +216,9 @@ class ValidateTokenView(APIView):
 
     def get(self, request):
         """
-        Validiert das Token direkt und überprüft die letzte Aktivität.
-        """
-        current_time = now()
-        inactivity_duration = (current_time - request.user.last_activity).total_seconds() / 60
-
-        if inactivity_duration > 1:
-            print(f"[ValidateTokenView] Token abgelaufen für Benutzer: {request.user.email}")
-            return Response({"message": "Token expired"}, status=status.HTTP_401_UNAUTHORIZED)
+        Validiert das Token direkt.
 
+        Abgelaufene Token werden bereits bei der Authentifizierung mit 401 abgelehnt.
+        """
         print(f"[ValidateTokenView] Token gültig für Benutzer: {request.user.email}")
         return Response({"message": "Token is valid"}, status=status.HTTP_200_OK)
\ No newline at end of file
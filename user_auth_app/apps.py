@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UserAuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_auth_app'
+
+    def ready(self):
+        """
+        Connects the signal handlers that keep the token cache consistent and
+        starts the background sweeper if ``INACTIVITY_SWEEPER`` is enabled for
+        this process.
+        """
+        from .api import authentication  # noqa: F401
+        if settings.INACTIVITY_SWEEPER:
+            from .api.sweeper import start_sweeper
+            start_sweeper()
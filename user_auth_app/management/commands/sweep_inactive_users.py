@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from user_auth_app.api.sweeper import sweep_inactive_users
+
+
+class Command(BaseCommand):
+    help = 'Deletes inactive guest users and expired tokens.'
+
+    def handle(self, *args, **options):
+        """
+        Runs a single sweep and reports how many rows were deleted.
+        """
+        guests, tokens = sweep_inactive_users()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {guests} inactive guests and {tokens} expired tokens."
+        ))
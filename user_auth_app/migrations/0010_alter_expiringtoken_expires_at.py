@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0009_expiringtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='expiringtoken',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
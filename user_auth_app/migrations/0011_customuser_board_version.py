@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0010_alter_expiringtoken_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='board_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
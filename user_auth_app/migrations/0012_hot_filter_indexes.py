@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth_app', '0011_customuser_board_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('is_guest', True)), fields=['last_activity'], name='customuser_guest_activity_idx'),
+        ),
+    ]
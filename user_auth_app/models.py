@@ -1,6 +1,11 @@
+import binascii
+import os
+from datetime import timedelta
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
+from .api.activity import activity_tracker
 from .api.validators import validate_username_format, validate_phone_format
 
 
@@ -19,16 +24,23 @@ class CustomUser(AbstractUser):
     color = models.CharField(max_length=100, null=True, blank=True)
     is_guest = models.BooleanField(default=False)
     last_activity = models.DateTimeField(null=True, blank=True)
+    board_version = models.PositiveBigIntegerField(default=0)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['last_activity'], condition=models.Q(is_guest=True), name='customuser_guest_activity_idx'),
+        ]
+
     def update_activity(self):
         """
-        Updates the last activity timestamp of the user.
+        Records activity of the user in the activity tracker.
+
+        The timestamp is written to the database with the next bulk flush.
         """
-        self.last_activity = timezone.now()
-        self.save(update_fields=['last_activity'])
+        activity_tracker.touch(self)
 
     def save(self, *args, **kwargs):
         """
@@ -53,4 +65,102 @@ class CustomUser(AbstractUser):
         :return: A string representation of the user instance
         :rtype: str
         """
-        return self.email
\ No newline at end of file
+        return self.email
+
+
+class ExpiringToken(models.Model):
+    key = models.CharField(max_length=40, primary_key=True)
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='auth_token')
+    created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    @staticmethod
+    def get_lifetime():
+        """
+        Returns how long a token stays valid without activity.
+
+        :rtype: datetime.timedelta
+        """
+        return timedelta(minutes=settings.INACTIVITY_TIMEOUT_MINUTES)
+
+    @classmethod
+    def generate_key(cls):
+        """
+        Returns a new random token key.
+
+        :rtype: str
+        """
+        return binascii.hexlify(os.urandom(20)).decode()
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the token, generating a random key and the expiry time for new tokens.
+
+        Tokens of pooled guest accounts are created with ``bulk_create`` and keep an
+        empty expiry time until the guest is claimed.
+        """
+        if not self.key:
+            self.key = self.generate_key()
+        if not self.expires_at:
+            self.expires_at = timezone.now() + self.get_lifetime()
+        super().save(*args, **kwargs)
+
+    def is_expired(self):
+        """
+        Returns True if the token has expired or has not been issued yet.
+
+        :rtype: bool
+        """
+        return self.expires_at is None or self.expires_at <= timezone.now()
+
+    def renew(self):
+        """
+        Extends the expiry time of the token by the token lifetime (sliding expiry).
+
+        To keep writes rare, the token is only renewed if it was last renewed more
+        than ``TOKEN_RENEW_INTERVAL`` seconds ago. The row is updated without
+        loading or saving the whole token.
+
+        :return: True if the token was renewed
+        :rtype: bool
+        """
+        expires_at = self.get_renewed_expiry()
+        if expires_at is None:
+            return False
+
+        ExpiringToken.objects.filter(key=self.key).update(expires_at=expires_at)
+        self.expires_at = expires_at
+        return True
+
+    async def arenew(self):
+        """
+        Async version of ``renew()``.
+
+        :return: True if the token was renewed
+        :rtype: bool
+        """
+        expires_at = self.get_renewed_expiry()
+        if expires_at is None:
+            return False
+
+        await ExpiringToken.objects.filter(key=self.key).aupdate(expires_at=expires_at)
+        self.expires_at = expires_at
+        return True
+
+    def get_renewed_expiry(self):
+        """
+        Returns the new expiry time of the token or None if the token was renewed
+        less than ``TOKEN_RENEW_INTERVAL`` seconds ago.
+
+        :rtype: datetime.datetime
+        """
+        expires_at = timezone.now() + self.get_lifetime()
+        if expires_at - self.expires_at < timedelta(seconds=settings.TOKEN_RENEW_INTERVAL):
+            return None
+        return expires_at
+
+    def __str__(self):
+        """
+        Returns the token key as a string.
+        """
+        return self.key
\ No newline at end of file
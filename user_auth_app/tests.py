@@ -1,3 +1,172 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from join_app.models import Contact, Subtask, Task, TaskUserDetails
+from .api import guests
+from .api.async_views import AsyncCurrentUser, AsyncValidateToken
+from .api.authentication import token_cache
+from .api.middleware import UpdateLastActivityMiddleware
+from .api.sweeper import sweep_inactive_users
+from .models import CustomUser, ExpiringToken
 
-# Create your tests here.
+
+class TokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.token = ExpiringToken.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def get_user(self):
+        return self.client.get(reverse('currentuser'))
+
+    def test_expired_token(self):
+        ExpiringToken.objects.filter(pk=self.token.pk).update(expires_at=now() - timedelta(seconds=1))
+        self.assertEqual(self.get_user().status_code, 401)
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_renewal(self):
+        expires_at = now() + ExpiringToken.get_lifetime() - timedelta(seconds=30)
+        ExpiringToken.objects.filter(pk=self.token.pk).update(expires_at=expires_at)
+        self.assertEqual(self.get_user().status_code, 200)
+        self.assertGreater(ExpiringToken.objects.get(pk=self.token.pk).expires_at, expires_at)
+
+    def test_renewed_by_another_worker(self):
+        self.assertEqual(self.get_user().status_code, 200)
+        _, cached_token = token_cache.get(self.token.key)
+        cached_token.expires_at = now() - timedelta(seconds=1)
+        self.assertEqual(self.get_user().status_code, 200)
+
+
+
+@override_settings(ACTIVITY_FLUSH_INTERVAL=0)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        self.token = ExpiringToken.objects.create(user=self.user)
+
+    async def get(self, view, key=None):
+        headers = {'Authorization': f'Token {key or self.token.key}'}
+        return await view.as_view()(AsyncRequestFactory().get('/', headers=headers))
+
+    async def test_current_user(self):
+        response = await self.get(AsyncCurrentUser)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['email'], 'owner@example.com')
+        self.assertEqual((await self.get(AsyncCurrentUser, 'invalid')).status_code, 401)
+
+    async def test_validate_token(self):
+        response = await self.get(AsyncValidateToken)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'message': 'Token is valid'})
+
+        await ExpiringToken.objects.filter(pk=self.token.pk).aupdate(expires_at=now() - timedelta(seconds=1))
+        token_cache.clear()
+        self.assertEqual((await self.get(AsyncValidateToken)).status_code, 401)
+
+    async def test_middleware_records_activity(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = UpdateLastActivityMiddleware(get_response)
+        request = AsyncRequestFactory().get('/')
+        request.user = self.user
+        self.assertEqual((await middleware(request)).status_code, 200)
+        await self.user.arefresh_from_db()
+        self.assertIsNotNone(self.user.last_activity)
+
+    async def test_middleware_loads_lazy_session_user(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        async def auser():
+            return AnonymousUser()
+
+        middleware = UpdateLastActivityMiddleware(get_response)
+        request = AsyncRequestFactory().get('/')
+        request.user = SimpleLazyObject(lambda: self.fail('The session user must be loaded with auser()'))
+        request.auser = auser
+        self.assertEqual((await middleware(request)).status_code, 200)
+
+
+class SweepTests(TestCase):
+    def test_expired_tokens_are_purged(self):
+        users = [
+            CustomUser.objects.create_user(username=f'user{index}', email=f'user{index}@example.com')
+            for index in range(3)
+        ]
+        expired = ExpiringToken.objects.create(user=users[0], expires_at=now() - timedelta(minutes=5))
+        valid = ExpiringToken.objects.create(user=users[1])
+        pooled = ExpiringToken.objects.bulk_create([ExpiringToken(key='pooled', user=users[2], expires_at=None)])[0]
+
+        self.assertEqual(sweep_inactive_users(), (0, 1))
+        self.assertFalse(ExpiringToken.objects.filter(pk=expired.pk).exists())
+        self.assertEqual(ExpiringToken.objects.filter(pk__in=[valid.pk, pooled.pk]).count(), 2)
+
+    def test_purge_guests(self):
+        owner = CustomUser.objects.create_user(username='owner', email='owner@example.com')
+        guest = guests.build_guest()
+        guest.save()
+        own_task = Task.objects.create(title='Guest task', date='2024-01-01', category='Work', status='todo',
+                                       created_by=guest)
+        Subtask.objects.create(task=own_task, subtasktext='Subtask')
+        Contact.objects.create(name='Max', email='max@example.com', phone='+49 123456', emblem='M',
+                               color='#000000', user=guest)
+        assigned_task = Task.objects.create(title='Owner task', date='2024-01-01', category='Work', status='todo',
+                                            created_by=owner)
+        TaskUserDetails.objects.create(task=assigned_task, user=guest)
+        Task.objects.filter(pk=assigned_task.pk).update(updated_at=now() - timedelta(days=1))
+
+        self.assertEqual(guests.purge_guests(CustomUser.objects.filter(pk=guest.pk)), 1)
+        self.assertFalse(Task.objects.filter(created_by=guest.pk).exists())
+        self.assertFalse(Subtask.objects.exists())
+        self.assertFalse(Contact.objects.exists())
+        self.assertFalse(TaskUserDetails.objects.exists())
+
+        assigned_task.refresh_from_db()
+        owner.refresh_from_db()
+        self.assertGreater(assigned_task.updated_at, now() - timedelta(minutes=1))
+        self.assertEqual(owner.board_version, 1)
+
+
+@override_settings(GUEST_POOL_SIZE=2, GUEST_POOL_LOW_WATER=1)
+class GuestPoolTests(TestCase):
+    def test_claim_from_pool(self):
+        self.assertEqual(guests.refill_guest_pool(), 2)
+        pooled_keys = set(ExpiringToken.objects.values_list('key', flat=True))
+
+        token = guests.claim_guest()
+        self.assertNotIn(token.key, pooled_keys)
+        self.assertTrue(token.user.is_guest)
+        self.assertFalse(token.is_expired())
+        self.assertEqual(guests.get_pool_size(), 1)
+        self.assertEqual(CustomUser.objects.count(), 2)
+
+    @override_settings(GUEST_POOL_LOW_WATER=0)
+    def test_claim_from_empty_pool(self):
+        token = guests.claim_guest()
+        self.assertTrue(token.user.is_guest)
+        self.assertFalse(token.is_expired())
+        self.assertEqual(guests.get_pool_size(), 0)
+
+    def test_refill_is_skipped_while_another_refill_runs(self):
+        with guests._refill_lock:
+            self.assertEqual(guests.refill_guest_pool(), 0)
+        self.assertEqual(guests.refill_guest_pool(), 2)
+        self.assertEqual(guests.refill_guest_pool(), 0)
+
+    def test_retired_guest_is_swept(self):
+        guests.refill_guest_pool()
+        token = guests.claim_guest()
+        guests.retire_guest(token.user)
+
+        self.assertEqual(sweep_inactive_users(), (1, 0))
+        self.assertFalse(CustomUser.objects.filter(pk=token.user.pk).exists())
+        self.assertEqual(guests.get_pool_size(), 1)